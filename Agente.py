@@ -0,0 +1,379 @@
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+from collections import namedtuple
+
+from BackendGPU import create_gpu_monitor
+from Recolector import MetricCollector, MetricSampler
+
+# Agente remoto: corre solo la recolección y envía cada muestra por TCP o
+# por un socket Unix a los visores conectados (EdgeWidget con --agent).
+#
+#   python -m Agente --listen 0.0.0.0:9465          # en cada equipo
+#   python -m Agente --listen unix:/tmp/monitor.sock
+#   python PanelProcesos.py --agent build01:9465 --agent build02:9465
+#
+# Protocolo: tramas con longitud (4 bytes, big-endian), tipo (1 byte) y
+# cuerpo. Una trama SCHEMA declara una vez los campos de cada namedtuple o
+# dict (id, nombre, campos); una trama SAMPLE lleva la muestra con solo los
+# valores: una etiqueta de un byte por valor, enteros como varint y floats
+# de 8 bytes. Así no viajan nombres de campo en cada muestra y los contadores
+# grandes ocupan lo que necesitan. La muestra se codifica una sola vez por
+# tick, sea cual sea el número de visores.
+
+DEFAULT_PORT = 9465
+HEADER = struct.Struct(">IB")
+FLOAT = struct.Struct(">d")
+SCHEMA, SAMPLE = 1, 2
+MAX_FRAME = 16 * 1024 * 1024
+# Un visor que no acepta datos en este tiempo se desconecta
+SEND_TIMEOUT_S = 2.0
+# Sin muestras en este tiempo el visor da la conexión por perdida
+RECV_TIMEOUT_S = 15.0
+# Espera del visor entre intentos de reconexión
+RECONNECT_S = 5.0
+
+T_NONE, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STR, T_LIST, T_RECORD = range(8)
+
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class SampleEncoder:
+    # Convierte muestras en tramas. Las declaraciones de esquema se guardan
+    # en declared para mandárselas a los visores que se conecten después.
+    def __init__(self):
+        self._schemas = {}
+        self.declared = []
+
+    def encode(self, snap):
+        # Devuelve las tramas nuevas: esquemas que aparecen por primera vez + la muestra
+        new = len(self.declared)
+        body = bytearray()
+        self._value(body, snap)
+        return self.declared[new:] + [self.frame(SAMPLE, body)]
+
+    @staticmethod
+    def frame(kind, body):
+        return HEADER.pack(len(body) + 1, kind) + bytes(body)
+
+    def _schema(self, name, fields):
+        key = (name, fields)
+        schema_id = self._schemas.get(key)
+        if schema_id is None:
+            schema_id = self._schemas[key] = len(self._schemas)
+            body = bytearray()
+            self._value(body, [schema_id, name, list(fields)])
+            self.declared.append(self.frame(SCHEMA, body))
+        return schema_id
+
+    def _value(self, out, value):
+        if value is None:
+            out.append(T_NONE)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif isinstance(value, int):
+            out.append(T_INT)
+            # zigzag: los negativos también ocupan poco
+            _put_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out.append(T_FLOAT)
+            out += FLOAT.pack(value)
+        elif isinstance(value, str):
+            data = value.encode("utf-8")
+            out.append(T_STR)
+            _put_varint(out, len(data))
+            out += data
+        elif isinstance(value, tuple) and hasattr(value, "_fields"):
+            schema_id = self._schema(type(value).__name__, value._fields)
+            out.append(T_RECORD)
+            _put_varint(out, schema_id)
+            for item in value:
+                self._value(out, item)
+        elif isinstance(value, dict):
+            schema_id = self._schema(None, tuple(value))
+            out.append(T_RECORD)
+            _put_varint(out, schema_id)
+            for item in value.values():
+                self._value(out, item)
+        elif isinstance(value, (list, tuple)):
+            out.append(T_LIST)
+            _put_varint(out, len(value))
+            for item in value:
+                self._value(out, item)
+        else:
+            # numpy y similares
+            self._value(out, value.item())
+
+
+class SampleDecoder:
+    # Inverso de SampleEncoder para una conexión: los namedtuple se
+    # reconstruyen con los campos declarados (mismo nombre de tipo)
+    def __init__(self):
+        self._schemas = {}
+        self._types = {}
+
+    def decode(self, kind, body):
+        # Devuelve la muestra, o None si la trama era una declaración
+        value, _ = self._value(memoryview(body), 0)
+        if kind == SCHEMA:
+            schema_id, name, fields = value
+            fields = tuple(fields)
+            if name is None:
+                self._schemas[schema_id] = (None, fields)
+            else:
+                cls = self._types.get((name, fields))
+                if cls is None:
+                    cls = self._types[name, fields] = namedtuple(name, fields)
+                self._schemas[schema_id] = (cls, fields)
+            return None
+        return value
+
+    def _varint(self, data, i):
+        n = shift = 0
+        while True:
+            b = data[i]
+            i += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n, i
+            shift += 7
+
+    def _value(self, data, i):
+        tag = data[i]
+        i += 1
+        if tag == T_NONE:
+            return None, i
+        if tag == T_TRUE:
+            return True, i
+        if tag == T_FALSE:
+            return False, i
+        if tag == T_INT:
+            n, i = self._varint(data, i)
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1), i
+        if tag == T_FLOAT:
+            return FLOAT.unpack_from(data, i)[0], i + FLOAT.size
+        if tag == T_STR:
+            n, i = self._varint(data, i)
+            return str(data[i:i + n], "utf-8"), i + n
+        if tag == T_LIST:
+            n, i = self._varint(data, i)
+            items = []
+            for _ in range(n):
+                item, i = self._value(data, i)
+                items.append(item)
+            return items, i
+        if tag == T_RECORD:
+            schema_id, i = self._varint(data, i)
+            cls, fields = self._schemas[schema_id]
+            items = []
+            for _ in fields:
+                item, i = self._value(data, i)
+                items.append(item)
+            return (dict(zip(fields, items)) if cls is None else cls(*items)), i
+        raise ValueError(f"etiqueta desconocida: {tag}")
+
+
+def parse_address(text, default_host="127.0.0.1"):
+    # "unix:/ruta", "equipo:puerto", ":puerto" o "equipo"
+    if text.startswith("unix:"):
+        return socket.AF_UNIX, text[5:]
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return socket.AF_INET, (host or default_host, int(port) if port else DEFAULT_PORT)
+
+
+class AgentServer:
+    # Acepta visores en un hilo aparte. publish() se registra como listener
+    # de MetricSampler: codifica la muestra una vez y la envía a todos.
+    def __init__(self, address=f"127.0.0.1:{DEFAULT_PORT}"):
+        self.family, self.address = parse_address(address)
+        self.encoder = SampleEncoder()
+        self.clients = []
+        self.last = None
+        self.server = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.server is not None:
+            return
+        server = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_UNIX:
+            # Un socket que quedó de una ejecución anterior impide el bind
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+        else:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(self.address)
+        server.listen()
+        if self.family != socket.AF_UNIX:
+            # Con puerto 0 el sistema elige uno libre
+            self.address = server.getsockname()[:2]
+        self.server = server
+        self.thread = threading.Thread(target=self._accept, name="AgentServer", daemon=True)
+        self.thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            conn.settimeout(SEND_TIMEOUT_S)
+            with self._lock:
+                # El visor nuevo recibe todos los esquemas y la última muestra
+                try:
+                    conn.sendall(b"".join(self.encoder.declared) + (self.last or b""))
+                except OSError:
+                    conn.close()
+                    continue
+                self.clients.append(conn)
+
+    def publish(self, snap):
+        with self._lock:
+            frames = self.encoder.encode(snap)
+            self.last = frames[-1]
+            data = b"".join(frames)
+            for conn in list(self.clients):
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    self.clients.remove(conn)
+                    conn.close()
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.close()
+        self.server = None
+        with self._lock:
+            for conn in self.clients:
+                conn.close()
+            self.clients = []
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class _RemoteFacts:
+    # Lo que el widget consulta de SystemFacts antes de la primera muestra
+    cores_logical = None
+
+
+class RemoteCollector:
+    # Se usa como un MetricCollector en el visor: sample() espera la
+    # siguiente muestra del agente. Si la conexión cae, lanza ConnectionError
+    # y el muestreador reintenta tras su intervalo (RECONNECT_S).
+    def __init__(self, address, timeout=RECV_TIMEOUT_S):
+        self.name = address
+        self.family, self.address = parse_address(address)
+        self.timeout = timeout
+        self.facts = _RemoteFacts()
+        # La tabla de procesos la decide el agente (--top)
+        self.processes_enabled = False
+        self._sock = None
+        self._file = None
+        self._decoder = None
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def _connect(self):
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rb")
+        self._decoder = SampleDecoder()
+
+    def _read(self, n):
+        data = self._file.read(n)
+        if len(data) < n:
+            raise ConnectionError("el agente cerró la conexión")
+        return data
+
+    def sample(self):
+        if self._sock is None:
+            self._connect()
+        try:
+            while True:
+                length, kind = HEADER.unpack(self._read(HEADER.size))
+                if not 1 <= length <= MAX_FRAME:
+                    raise ConnectionError(f"trama inválida ({length} bytes)")
+                snap = self._decoder.decode(kind, self._read(length - 1))
+                if snap is not None:
+                    self.facts.cores_logical = snap.get('cores_logical')
+                    return snap
+        except (OSError, ValueError, IndexError, KeyError) as e:
+            self.close()
+            raise ConnectionError(str(e)) from e
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+            self._file = None
+
+
+class StreamSchedule:
+    # Intervalo del muestreador del visor: el ritmo lo marca el agente, así
+    # que en cuanto llega una muestra se espera la siguiente
+    def __init__(self):
+        self.state = None
+
+    def next(self, snap):
+        return 0.0
+
+
+def remote_sampler(address):
+    return MetricSampler(interval=RECONNECT_S, collector=RemoteCollector(address), schedule=StreamSchedule())
+
+
+def run(listen, interval, gpu_binary="nvidia-smi", top=0):
+    collector = MetricCollector(create_gpu_monitor(gpu_binary, period_ms=max(100, int(interval * 1000))),
+                                top_n=top)
+    collector.processes_enabled = top > 0
+    sampler = MetricSampler(interval=interval, collector=collector)
+    server = AgentServer(listen)
+    sampler.listeners.append(server.publish)
+    server.start()
+    sampler.start()
+    print(f"Agente escuchando en {listen}", file=sys.stderr)
+    try:
+        while sampler.thread.is_alive():
+            sampler.thread.join(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Agente", description="Envía las muestras de este equipo a los visores")
+    parser.add_argument("--listen", default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help="equipo:puerto o unix:/ruta (por defecto solo localhost)")
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre muestras (por defecto 1.0)")
+    parser.add_argument("--gpu-binary", default="nvidia-smi", help="ruta o nombre de nvidia-smi")
+    parser.add_argument("--top", type=int, default=0, help="incluye los N procesos principales en cada muestra")
+    args = parser.parse_args(argv)
+    run(args.listen, args.interval, args.gpu_binary, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import logging
+import operator
+import os
+from collections import deque, namedtuple
+
+# Motor de alertas evaluado muestra a muestra sobre las mismas métricas que
+# se guardan en el historial. Cada regla mantiene su propio estado (ventana
+# deslizante, instante de inicio, última vez visto), así que evaluarla cuesta
+# O(1) por muestra (amortizado en las ventanas) sin releer el historial.
+
+log = logging.getLogger("Alertas")
+
+AlertEvent = namedtuple("AlertEvent", "time rule firing value")
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+class Rule:
+    # update(t, value) devuelve True mientras la condición se cumple.
+    # value es None cuando la métrica no llegó en esta muestra.
+    def __init__(self, name, metric):
+        self.name = name
+        self.metric = metric
+
+    def update(self, t, value):
+        raise NotImplementedError
+
+
+class Threshold(Rule):
+    def __init__(self, name, metric, op, limit):
+        super().__init__(name, metric)
+        self.op = OPS[op]
+        self.limit = limit
+
+    def update(self, t, value):
+        return value is not None and self.op(value, self.limit)
+
+
+class Sustained(Threshold):
+    # El umbral tiene que cumplirse sin interrupción durante duration segundos
+    def __init__(self, name, metric, op, limit, duration):
+        super().__init__(name, metric, op, limit)
+        self.duration = duration
+        self._since = None
+
+    def update(self, t, value):
+        if not super().update(t, value):
+            self._since = None
+            return False
+        if self._since is None:
+            self._since = t
+        return t - self._since >= self.duration
+
+
+class _Window(Rule):
+    # Ventana deslizante de window segundos: cada muestra entra una vez y
+    # sale una vez, con una suma acumulada para la media. Se conserva la
+    # última muestra anterior al inicio de la ventana (el valor vigente en
+    # ese momento): con muestras más espaciadas que la ventana (10 s con la
+    # ventana escondida) siempre queda una referencia con la que comparar
+    def __init__(self, name, metric, window):
+        super().__init__(name, metric)
+        self.window = window
+        self._points = deque()
+        self._sum = 0.0
+
+    def _push(self, t, value):
+        self._points.append((t, value))
+        self._sum += value
+        while len(self._points) > 1 and self._points[1][0] <= t - self.window:
+            self._sum -= self._points.popleft()[1]
+
+
+class RateOfChange(_Window):
+    # Variación (unidades por segundo) entre la muestra más antigua de la
+    # ventana y la actual; limit negativo para caídas
+    def __init__(self, name, metric, limit, window):
+        super().__init__(name, metric, window)
+        self.limit = limit
+
+    def update(self, t, value):
+        if value is None:
+            return False
+        self._push(t, value)
+        t0, v0 = self._points[0]
+        if t == t0:
+            return False
+        rate = (value - v0) / (t - t0)
+        return rate >= self.limit if self.limit >= 0 else rate <= self.limit
+
+
+class Average(_Window):
+    # Media de la ventana comparada con un umbral (suaviza picos sueltos)
+    def __init__(self, name, metric, op, limit, window):
+        super().__init__(name, metric, window)
+        self.op = OPS[op]
+        self.limit = limit
+
+    def update(self, t, value):
+        if value is None:
+            return False
+        self._push(t, value)
+        return self.op(self._sum / len(self._points), self.limit)
+
+
+class Absent(Rule):
+    # Sin datos de la métrica durante timeout segundos. Solo cuenta después
+    # de haberla visto alguna vez (un equipo sin GPU no está en alerta)
+    def __init__(self, name, metric, timeout):
+        super().__init__(name, metric)
+        self.timeout = timeout
+        self._last_seen = None
+
+    def update(self, t, value):
+        if value is not None:
+            self._last_seen = t
+            return False
+        return self._last_seen is not None and t - self._last_seen >= self.timeout
+
+
+def default_rules():
+    # Reglas por defecto del widget (métricas = claves del historial). Cada
+    # regla guarda estado, así que cada motor recibe instancias nuevas.
+    return [
+        Sustained("CPU > 90% durante 1 min", "cpu", ">", 90, 60),
+        Sustained("RAM > 90% durante 30 s", "ram", ">", 90, 30),
+        # full: ninguna tarea avanza por falta de memoria (el equipo está paginando)
+        Sustained("Memoria parada (PSI full) > 10% durante 30 s", "mem_stall_full", ">", 10, 30),
+        RateOfChange("Pico de escritura en disco", "disk_write", 100, 5),
+        Average("Red > 50 MB/s (media 1 min)", "net_down", ">", 50, 60),
+        Absent("GPU sin datos", "gpu", 30),
+    ]
+
+
+class AlertEngine:
+    def __init__(self, rules=None):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self._active = {}
+        # Copia inmutable de las alertas activas para el hilo de la interfaz
+        self.firing = ()
+
+    def evaluate(self, t, values):
+        # values: {métrica: valor}; devuelve solo los cambios de estado
+        events = []
+        for rule in self.rules:
+            value = values.get(rule.metric)
+            firing = rule.update(t, value)
+            if firing != (rule.name in self._active):
+                event = AlertEvent(t, rule.name, firing, value)
+                events.append(event)
+                if firing:
+                    self._active[rule.name] = event
+                else:
+                    del self._active[rule.name]
+        if events:
+            self.firing = tuple(self._active.values())
+            for event in events:
+                if event.firing:
+                    log.warning("ALERTA %s (valor %s)", event.rule, event.value)
+                else:
+                    log.info("resuelta %s", event.rule)
+        return events
+
+
+def open_alert_log(path=None):
+    # Registro de alertas en ~/.monitorecursos/alertas.log
+    path = path or os.path.join(os.path.expanduser("~"), ".monitorecursos", "alertas.log")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.FileHandler(path, encoding="utf-8")
+    except OSError:
+        return None
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    return handler
@@ -0,0 +1,211 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+# Misma forma que los objetos de GPUtil (load en 0-1, memoria en MB) para
+# que la interfaz no dependa del backend que esté activo
+GpuInfo = namedtuple("GpuInfo", "index name load memoryUsed memoryTotal temperature")
+
+# Donde lo instala el controlador en Windows (fuera del PATH); GPUtil también lo busca ahí
+NVSMI_WINDOWS = os.path.join(os.environ.get("SystemDrive", "C:") + os.sep, "Program Files", "NVIDIA Corporation",
+                             "NVSMI", "nvidia-smi.exe")
+
+QUERY_FIELDS = ("index", "name", "utilization.gpu", "memory.used", "memory.total", "temperature.gpu")
+
+
+class GpuBackendError(Exception):
+    pass
+
+
+def _number(text):
+    # nvidia-smi devuelve "[N/A]" o "[Not Supported]" en campos no disponibles
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_query_line(line):
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) < len(QUERY_FIELDS):
+        return None
+    try:
+        index = int(parts[0])
+    except ValueError:
+        return None
+    # El nombre podría contener comas: los campos numéricos se toman desde el final
+    load, mem_used, mem_total, temp = (_number(p) for p in parts[-4:])
+    name = ", ".join(parts[1:-4])
+    return GpuInfo(index, name, (load or 0.0) / 100, mem_used or 0.0, mem_total or 0.0, temp)
+
+
+class NvidiaSmiStream:
+    # Una sola sesión de nvidia-smi en modo bucle (-lms) cuya salida se lee
+    # línea a línea en un hilo aparte. get_gpus() solo devuelve la última
+    # tanda ya parseada, sin lanzar procesos ni bloquear. Un proceso que
+    # muere, se cuelga o no responde al arrancar se relanza; solo se
+    # abandona tras max_restarts reinicios seguidos sin recibir datos.
+    name = "nvidia-smi"
+
+    def __init__(self, command=None, period_ms=1000, timeout=5.0, max_restarts=3):
+        self.command = list(command or ["nvidia-smi"])
+        self.period_ms = period_ms
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.proc = None
+        self._latest = None
+        self._latest_time = 0.0
+        self._started_at = 0.0
+        self._started = False
+        self._alive = False
+        self._lock = threading.Lock()
+
+    def full_command(self):
+        return self.command + [
+            "--query-gpu=" + ",".join(QUERY_FIELDS),
+            "--format=csv,noheader,nounits",
+            "-lms", str(self.period_ms),
+        ]
+
+    def start(self):
+        with self._lock:
+            if self._alive:
+                return
+            try:
+                self.proc = subprocess.Popen(self.full_command(), stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL, text=True, bufsize=1)
+            except OSError as e:
+                raise GpuBackendError(f"no se pudo lanzar {self.command[0]}: {e}")
+            self._alive = True
+            self._started_at = time.monotonic()
+            threading.Thread(target=self._read, args=(self.proc,), name="NvidiaSmiStream", daemon=True).start()
+
+    def _read(self, proc):
+        # Cada línea actualiza su GPU por índice y se publica al momento, sin
+        # esperar a que termine la tanda
+        by_index = {}
+        for line in proc.stdout:
+            gpu = parse_query_line(line)
+            if gpu is None:
+                continue
+            by_index[gpu.index] = gpu
+            if self.proc is proc:
+                self._latest = tuple(by_index[i] for i in sorted(by_index))
+                self._latest_time = time.monotonic()
+        # Un lector de un proceso ya reemplazado no debe tocar el estado actual
+        if self.proc is proc:
+            self._alive = False
+
+    def get_gpus(self):
+        now = time.monotonic()
+        if not self._alive:
+            if self._started:
+                if self.restarts >= self.max_restarts:
+                    raise GpuBackendError("nvidia-smi falló demasiadas veces seguidas")
+                self.restarts += 1
+                self.close()
+            self._started = True
+            self.start()
+
+        if self._latest is None:
+            if now - self._started_at > self.timeout:
+                # Sin salida a tiempo (un nvidia-smi en frío sin modo
+                # persistente puede tardar): cuenta como un reinicio más
+                self.close()
+            return []
+
+        # Llegan datos: los reinicios anteriores funcionaron
+        self.restarts = 0
+        if now - self._latest_time > self.timeout:
+            # Proceso colgado: se mata y el siguiente get_gpus lo relanza
+            self.close()
+            return []
+        return list(self._latest)
+
+    def close(self):
+        with self._lock:
+            proc, self.proc = self.proc, None
+            self._alive = False
+            self._latest = None
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+class GPUtilBackend:
+    # Respaldo: GPUtil lanza un nvidia-smi por consulta, así que solo se usa
+    # si la sesión persistente no está disponible, y como mucho una vez cada
+    # MIN_INTERVAL_S (entre medias se repite la última lectura aunque el
+    # muestreo vaya a 10 Hz)
+    name = "GPUtil"
+    MIN_INTERVAL_S = 1.0
+
+    def __init__(self):
+        self._gputil = None
+        self._last = None
+        self._next = 0.0
+
+    def get_gpus(self):
+        now = time.monotonic()
+        if self._last is not None and now < self._next:
+            return list(self._last)
+        self._next = now + self.MIN_INTERVAL_S
+        self._last = self._query()
+        return list(self._last)
+
+    def _query(self):
+        if self._gputil is None:
+            try:
+                import GPUtil
+            except Exception:
+                raise GpuBackendError("GPUtil no instalado")
+            self._gputil = GPUtil
+        try:
+            gpus = self._gputil.getGPUs()
+        except Exception as e:
+            raise GpuBackendError(f"GPUtil falló: {e}")
+        return [GpuInfo(i, g.name, g.load, g.memoryUsed, g.memoryTotal, getattr(g, 'temperature', None))
+                for i, g in enumerate(gpus)]
+
+    def close(self):
+        pass
+
+
+class GpuMonitor:
+    # Usa el primer backend que funcione y pasa al siguiente cuando uno falla
+    def __init__(self, backends):
+        self.backends = list(backends)
+
+    @property
+    def name(self):
+        return self.backends[0].name if self.backends else None
+
+    def get_gpus(self):
+        while self.backends:
+            try:
+                return self.backends[0].get_gpus()
+            except GpuBackendError:
+                self.backends.pop(0).close()
+        return []
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+def create_gpu_monitor(binary="nvidia-smi", period_ms=1000):
+    backends = []
+    path = shutil.which(binary)
+    if not path and binary == "nvidia-smi" and os.path.isfile(NVSMI_WINDOWS):
+        path = NVSMI_WINDOWS
+    if path:
+        backends.append(NvidiaSmiStream(command=[path], period_ms=period_ms))
+    backends.append(GPUtilBackend())
+    return GpuMonitor(backends)
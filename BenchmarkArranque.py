@@ -0,0 +1,72 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Benchmark de arranque en frío: cada corrida es un proceso nuevo para que
+# las importaciones no queden en caché. Mide:
+#   import  -> importar PanelProcesos (ttkbootstrap, numpy, psutil)
+#   window  -> EdgeWidget construido y primer frame pintado
+#   chart   -> primera muestra del muestreador y primera mini-gráfica
+#              creada y dibujada (tk.Canvas, sin Matplotlib)
+# Todos los tiempos son en ms desde el inicio del proceso hijo. El historial
+# se crea en un directorio temporal para no tocar el del usuario.
+
+
+def run_child():
+    t0 = time.perf_counter()
+    import PanelProcesos
+    t_import = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = PanelProcesos.open_history(PanelProcesos.HISTORY_KEYS, PanelProcesos.HISTORY_CAPACITY, directory)
+        app = PanelProcesos.EdgeWidget(history=history)
+        app.root.update()
+        t_window = time.perf_counter()
+
+        # Como update_stats: la muestra la toma el hilo del muestreador y la
+        # interfaz solo la lee (sample() aquí competiría con ese hilo)
+        snap = app.sampler.latest() or app.last_snap
+        while snap is None:
+            time.sleep(0.005)
+            snap = app.sampler.latest()
+        app.mini_chart(app.current_panel)
+        app.render(snap)
+        app.root.update()
+        t_chart = time.perf_counter()
+
+        app.close()
+    print(json.dumps({
+        'import': (t_import - t0) * 1000,
+        'window': (t_window - t0) * 1000,
+        'chart': (t_chart - t0) * 1000,
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque del widget")
+    parser.add_argument("--runs", type=int, default=5, help="número de arranques en frío")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child()
+        return 0
+
+    results = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'fase':<8} {'min':>9} {'mediana':>9} {'max':>9}  (ms, {args.runs} corridas)")
+    for key in ('import', 'window', 'chart'):
+        values = [r[key] for r in results]
+        print(f"{key:<8} {min(values):9.1f} {statistics.median(values):9.1f} {max(values):9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
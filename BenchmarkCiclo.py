@@ -0,0 +1,223 @@
+import argparse
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Benchmark del coste de un tick del widget con datos deterministas: psutil
+# se sustituye por PsutilFalso y la GPU por una tarjeta falsa, así que dos
+# corridas sobre el mismo código dan los mismos conteos. Por cada modo
+# (compacto / expandido), panel y longitud de historial mide:
+#   recoleccion -> MetricSampler.sample() (métricas + escritura del historial)
+#   render      -> EdgeWidget.update_stats() (lectura de la cola + dibujo)
+#   KB          -> pico de memoria reservada durante el tick (tracemalloc)
+#   tk          -> llamadas al intérprete Tcl/Tk por tick
+#   draw / blit / artist -> dibujos completos, blits y draw_artist de Matplotlib
+#
+#   python BenchmarkCiclo.py --ticks 50 --lengths 30 1000 100000
+#   python BenchmarkCiclo.py --headless     # solo recolección, sin pantalla
+
+import PsutilFalso
+PsutilFalso.install()
+
+from BackendGPU import GpuInfo, GpuMonitor
+from Recolector import MetricCollector
+
+DEFAULT_LENGTHS = (30, 1000, 10000, 100000)
+COMPACT_PANELS = ("cpu", "ram", "disk", "net", "gpu", "sys")
+EXPANDED_PANELS = ("cpu", "ram", "disk", "net", "gpu", "sys", "procs")
+
+
+class FakeGpu:
+    name = "falsa"
+
+    def get_gpus(self):
+        tick = PsutilFalso._tick
+        return [GpuInfo(0, "GPU falsa", tick % 100 / 100, 1024.0 + tick % 256, 8192.0, 40 + tick % 10)]
+
+    def close(self):
+        pass
+
+
+def fake_collector(top_n):
+    return MetricCollector(gpu_monitor=GpuMonitor([FakeGpu()]), top_n=top_n)
+
+
+class CountingTk:
+    # Envuelve el intérprete de Tk: todos los widgets heredan root.tk, así
+    # que cada config/geometry/blit pasa por call()
+    def __init__(self, tk):
+        self._tk = tk
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+
+class Counters:
+    def __init__(self):
+        self.tk = None
+        self.draw = 0
+        self.blit = 0
+        self.artist = 0
+
+    def snapshot(self):
+        return (self.tk.calls if self.tk else 0, self.draw, self.blit, self.artist)
+
+
+def install_counters(counters):
+    # Se parchean las clases antes de crear la ventana para contar también
+    # lo que hacen los widgets creados más tarde
+    import tkinter
+    from matplotlib.axes import Axes
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    tk_init = tkinter.Tk.__init__
+
+    def init(self, *args, **kwargs):
+        tk_init(self, *args, **kwargs)
+        self.tk = counters.tk = CountingTk(self.tk)
+    tkinter.Tk.__init__ = init
+
+    def counted(cls, method, field):
+        original = getattr(cls, method)
+
+        def wrapper(*args, **kwargs):
+            setattr(counters, field, getattr(counters, field) + 1)
+            return original(*args, **kwargs)
+        setattr(cls, method, wrapper)
+
+    counted(FigureCanvasTkAgg, "draw", "draw")
+    counted(FigureCanvasTkAgg, "blit", "blit")
+    counted(Axes, "draw_artist", "artist")
+
+
+def fake_history(keys, length, now):
+    # Historial en memoria con length muestras a 1 Hz terminando en now
+    from Historial import RollupSeries, TimeSeries
+    times = now - np.arange(length, 0, -1, dtype=np.float64)
+    history = {}
+    for i, key in enumerate(keys):
+        raw = TimeSeries(max(length, 1))
+        raw.extend(times, 50 + 40 * np.sin(np.arange(length) / 30 + i))
+        history[key] = RollupSeries(raw)
+    return history
+
+
+def measure(tick, ticks, alloc_ticks, counters=None):
+    # Primera pasada: tiempos y conteos. Segunda, más corta: memoria (tracemalloc
+    # ralentiza todo y no debe contaminar los tiempos).
+    phases = []
+    start = counters.snapshot() if counters else None
+    for _ in range(ticks):
+        phases.append(tick())
+    counts = None
+    if counters:
+        end = counters.snapshot()
+        counts = [(b - a) / ticks for a, b in zip(start, end)]
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(alloc_ticks):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        tick()
+        peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+    tracemalloc.stop()
+
+    columns = list(zip(*phases))
+    return [statistics.median(c) * 1000 for c in columns], [max(c) * 1000 for c in columns], statistics.median(peaks), counts
+
+
+def run_headless(args):
+    collector = fake_collector(top_n=15)
+    collector.processes_enabled = True
+
+    def tick():
+        PsutilFalso.advance()
+        t0 = time.perf_counter()
+        collector.sample()
+        return (time.perf_counter() - t0,)
+
+    medians, maxima, kb, _ = measure(tick, args.ticks, args.alloc_ticks)
+    print(f"recoleccion  mediana {medians[0]:.3f} ms  max {maxima[0]:.3f} ms  {kb:.1f} KB/tick")
+    collector.close()
+
+
+def run_ui(args):
+    counters = Counters()
+    install_counters(counters)
+
+    import PanelProcesos
+    # Los datos falsos disparan alertas: se evalúan igual pero sin escribirlas en la salida
+    logging.getLogger("Alertas").addHandler(logging.NullHandler())
+    app = PanelProcesos.EdgeWidget(collector=fake_collector(PanelProcesos.TOP_PROCESSES),
+                                   history=fake_history(PanelProcesos.HISTORY_KEYS, 30, time.time()))
+    # El muestreo lo lleva el benchmark: se para el hilo, el widget queda
+    # abierto y update_stats no se reprograma (cada tick lo llama el bucle)
+    app.sampler.stop()
+    app.sampler.thread.join()
+    app.is_open = True
+    app.root.update()
+    app.root.after = lambda ms, func=None, *args: None
+
+    def tick():
+        PsutilFalso.advance()
+        t0 = time.perf_counter()
+        app.sampler.publish(app.sampler.sample())
+        t1 = time.perf_counter()
+        app.update_stats()
+        return t1 - t0, time.perf_counter() - t1
+
+    print(f"{'modo':<9} {'panel':<6} {'historial':>9} {'recol ms':>9} {'render ms':>9} {'max ms':>8} "
+          f"{'KB':>7} {'tk':>6} {'draw':>5} {'blit':>5} {'artist':>6}")
+    for mode, panels in (("compacto", COMPACT_PANELS), ("expandido", EXPANDED_PANELS)):
+        if mode == "expandido":
+            app.toggle_expand(panels[0])
+            app.range_var.set(args.range)
+            app.set_range()
+        for length in args.lengths:
+            with app.history_lock:
+                app.host.history = fake_history(PanelProcesos.HISTORY_KEYS, length, time.time())
+            for panel in panels:
+                if panel not in args.panels:
+                    continue
+                if mode == "compacto":
+                    app.show_panel(panel)
+                else:
+                    app.show_expanded_panel(panel)
+                # Primer dibujo completo fuera de la medida
+                app.root.update()
+                tick()
+                medians, maxima, kb, counts = measure(tick, args.ticks, args.alloc_ticks, counters)
+                print(f"{mode:<9} {panel:<6} {length:>9} {medians[0]:9.3f} {medians[1]:9.3f} {max(maxima):8.3f} "
+                      f"{kb:7.1f} {counts[0]:6.1f} {counts[1]:5.2f} {counts[2]:5.2f} {counts[3]:6.1f}")
+    app.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del coste por tick del widget")
+    parser.add_argument("--ticks", type=int, default=50, help="ticks medidos por combinación")
+    parser.add_argument("--alloc-ticks", type=int, default=5, help="ticks medidos con tracemalloc")
+    parser.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS, help="longitudes de historial")
+    parser.add_argument("--panels", nargs="+", default=EXPANDED_PANELS, help="paneles a medir")
+    parser.add_argument("--range", default="10m", help="rango de las gráficas grandes")
+    parser.add_argument("--headless", action="store_true", help="solo recolección (sin Tk)")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        run_headless(args)
+    else:
+        run_ui(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+import getpass
+import platform
+import socket
+import time
+
+import psutil
+
+import Presion
+from Dispositivos import CounterRates, DiskRate, NicRate, counter_delta, whole_disks
+from Procesos import ProcessTable
+
+MB = 1024 * 1024
+# Intervalo mínimo entre dos lecturas para calcular una tasa
+MIN_DT = 0.001
+
+# Reloj de las lecturas de contadores: monotónico, así que un cambio de hora
+# no altera las tasas. perf_counter y no monotonic porque en Windows
+# monotonic (antes de Python 3.13) va a saltos de ~15.6 ms, mucho error para
+# tasas a 10 Hz. Se consulta a través del módulo para que Grabacion pueda
+# grabarlo y reproducirlo.
+clock = time.perf_counter
+
+
+def stamped(read, *args, **kwargs):
+    # Lee un contador y devuelve (hora, valor); la hora es el punto medio de
+    # la llamada, no el momento en que empezó la muestra
+    t0 = clock()
+    value = read(*args, **kwargs)
+    return (t0 + clock()) / 2, value
+
+
+def rate_mb_s(value, prev, dt):
+    return counter_delta(value, prev) / MB / max(MIN_DT, dt)
+
+
+class SystemFacts:
+    # Datos del sistema que no cambian durante la sesión. Se leen una vez y
+    # solo se vuelven a consultar si cambia el nombre del equipo o si se
+    # detecta una reanudación tras suspender: un salto entre la hora de pared
+    # y clock() (en Linux el monotónico se para al suspender) o un cambio de
+    # boot_time en la comprobación periódica. En una reproducción (live =
+    # False) no se comprueba nada: las horas grabadas no son de esta máquina.
+    HOSTNAME_CHECK_S = 60.0
+    # Diferencia entre reloj de pared y clock() que se toma como suspensión
+    SUSPEND_GAP_S = 5.0
+    # boot_time se calcula desde el reloj de pared y oscila algo con NTP
+    BOOT_TIME_TOLERANCE_S = 2.0
+
+    def __init__(self):
+        self.live = True
+        self.refresh()
+        self._wall = time.time()
+        self._mono = self._last_host_check = clock()
+
+    def refresh(self):
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "N/A"
+
+        self.cores_physical = psutil.cpu_count(logical=False)
+        self.cores_logical = psutil.cpu_count(logical=True)
+        self.os = f"{platform.system()} {platform.release()}"
+        self.host = platform.node()
+        self.boot_time = psutil.boot_time()
+        self.user = user
+
+        self._hostname = socket.gethostname()
+
+    def check(self, wall, mono):
+        # Llamado en cada tick: solo aritmética salvo la comprobación
+        # periódica del hostname y de boot_time
+        if not self.live:
+            return False
+        suspended = (wall - self._wall) - (mono - self._mono) > self.SUSPEND_GAP_S
+        self._wall = wall
+        self._mono = mono
+        if not suspended and mono - self._last_host_check < self.HOSTNAME_CHECK_S:
+            return False
+
+        self._last_host_check = mono
+        if (suspended or socket.gethostname() != self._hostname
+                or abs(psutil.boot_time() - self.boot_time) > self.BOOT_TIME_TOLERANCE_S):
+            self.refresh()
+            return True
+        return False
+
+
+class Collector:
+    # Interfaz de un colector: collect(now, dt) devuelve un dict con las
+    # claves de la muestra que le corresponden: exactamente las declaradas
+    # en keys (el registro lo comprueba y cuenta otra cosa como error).
+    #   interval  -> segundos mínimos entre lecturas; entre medias el
+    #                registro reutiliza la última (0 = en cada muestra)
+    #   budget_ms -> coste esperado; las lecturas más lentas se cuentan en
+    #                las estadísticas del registro
+    # dt son los segundos (monotónicos) desde la lectura anterior de este
+    # colector; las tasas de contadores usan la hora de cada lectura (stamped).
+    name = None
+    keys = ()
+    interval = 0.0
+    budget_ms = 5.0
+
+    def collect(self, now, dt):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CollectorStats:
+    __slots__ = ("runs", "errors", "over_budget", "last_ms", "max_ms", "total_ms")
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.over_budget = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+
+class CollectorRegistry:
+    # Colectores registrados por nombre, cada uno con su propio intervalo,
+    # caché de la última lectura y tiempos. collect() compone la muestra
+    # plana que usan la interfaz y el modo headless. Los intervalos se miden
+    # con clock(); now (hora de pared) solo se usa para la hora de la muestra.
+    # summary() resume los contadores de stats (Instrumentation, /stats).
+    def __init__(self, collectors=()):
+        self._collectors = {}
+        self._keys = {}
+        self._cache = {}
+        self._last_run = {}
+        self.stats = {}
+        # Callback opcional (nombre, ms) con el tiempo de cada lectura
+        self.timing = None
+        for collector in collectors:
+            self.register(collector)
+
+    def register(self, collector):
+        if collector.name in self._collectors:
+            raise ValueError(f"colector duplicado: {collector.name}")
+        self._collectors[collector.name] = collector
+        self._keys[collector.name] = frozenset(collector.keys)
+        self._last_run[collector.name] = clock()
+        self.stats[collector.name] = CollectorStats()
+
+    def start(self):
+        # Fija la hora de referencia de todos los colectores (la primera
+        # muestra mide desde aquí); la usan la grabación y la reproducción
+        now = clock()
+        for name in self._last_run:
+            self._last_run[name] = now
+
+    def collect(self, now):
+        snap = {'time': now}
+        mono = clock()
+        for name, collector in self._collectors.items():
+            cached = self._cache.get(name)
+            last = self._last_run[name]
+            if cached is None or mono - last >= collector.interval:
+                stats = self.stats[name]
+                t0 = time.perf_counter()
+                try:
+                    result = collector.collect(now, max(MIN_DT, mono - last))
+                    if result.keys() != self._keys[name]:
+                        raise ValueError(f"colector {name}: claves {sorted(result)} en lugar de {sorted(collector.keys)}")
+                    cached = result
+                except Exception:
+                    # Sin lectura previa no hay nada que mostrar: el fallo sube
+                    stats.errors += 1
+                    if cached is None:
+                        raise
+                else:
+                    self._cache[name] = cached
+                    self._last_run[name] = mono
+                elapsed = (time.perf_counter() - t0) * 1000
+                stats.runs += 1
+                stats.last_ms = elapsed
+                stats.total_ms += elapsed
+                if elapsed > stats.max_ms:
+                    stats.max_ms = elapsed
+                if elapsed > collector.budget_ms:
+                    stats.over_budget += 1
+                if self.timing is not None:
+                    self.timing(name, elapsed)
+            snap.update(cached)
+        return snap
+
+    def summary(self):
+        return {
+            name: {
+                'runs': stats.runs,
+                'errors': stats.errors,
+                'over_budget': stats.over_budget,
+                'budget_ms': self._collectors[name].budget_ms,
+                'max_ms': stats.max_ms,
+                'avg_ms': stats.total_ms / stats.runs if stats.runs else 0.0,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def close(self):
+        for collector in self._collectors.values():
+            collector.close()
+
+
+class CpuCollector(Collector):
+    name = "cpu"
+    keys = ("cpu", "cpu_per_core", "freq", "cores_physical", "cores_logical")
+    budget_ms = 2.0
+
+    def __init__(self, facts):
+        self.facts = facts
+        # La primera llamada solo fija la referencia
+        psutil.cpu_percent(None)
+        psutil.cpu_percent(percpu=True)
+
+    def collect(self, now, dt):
+        freq = psutil.cpu_freq()
+        return {
+            'cpu': psutil.cpu_percent(interval=None),
+            'cpu_per_core': psutil.cpu_percent(percpu=True),
+            'freq': freq.current if freq and freq.current else None,
+            'cores_physical': self.facts.cores_physical,
+            'cores_logical': self.facts.cores_logical,
+        }
+
+
+class MemoryCollector(Collector):
+    name = "ram"
+    keys = ("vm",)
+    budget_ms = 1.0
+
+    def collect(self, now, dt):
+        return {'vm': psutil.virtual_memory()}
+
+
+class PressureCollector(Collector):
+    # Presión de memoria: swap, tiempo parado según PSI (memoria, disco y
+    # CPU) y tasas de paginación. Presion se consulta a través del módulo
+    # para que Grabacion pueda grabar sus lecturas. Sin PSI o sin vmstat
+    # (no Linux) esas claves van a None; el swap viene de psutil en todos.
+    name = "pressure"
+    keys = ("swap", "psi", "page_in_mb_s", "page_out_mb_s", "swap_in_mb_s", "swap_out_mb_s", "major_faults_s")
+    budget_ms = 1.0
+
+    def __init__(self):
+        self.prev_t, self.prev = stamped(self._read)
+
+    def _read(self):
+        return (psutil.swap_memory(), Presion.read_vmstat(),
+                {resource: Presion.read_psi(resource) for resource in Presion.PSI_RESOURCES})
+
+    def collect(self, now, dt):
+        t, cur = stamped(self._read)
+        dt = max(MIN_DT, t - self.prev_t)
+        (swap, vm, psi), (prev_swap, prev_vm, prev_psi) = cur, self.prev
+        self.prev, self.prev_t = cur, t
+
+        snap = {
+            'swap': swap,
+            'psi': {resource: Presion.stall(psi[resource], prev_psi[resource], dt)
+                    if psi[resource] and prev_psi[resource] else None for resource in psi},
+            'swap_in_mb_s': rate_mb_s(swap.sin, prev_swap.sin, dt),
+            'swap_out_mb_s': rate_mb_s(swap.sout, prev_swap.sout, dt),
+            'page_in_mb_s': None,
+            'page_out_mb_s': None,
+            'major_faults_s': None,
+        }
+        if vm and prev_vm:
+            # pgpgin/pgpgout cuentan KB
+            snap['page_in_mb_s'] = rate_mb_s(vm.pgpgin * 1024, prev_vm.pgpgin * 1024, dt)
+            snap['page_out_mb_s'] = rate_mb_s(vm.pgpgout * 1024, prev_vm.pgpgout * 1024, dt)
+            snap['major_faults_s'] = counter_delta(vm.pgmajfault, prev_vm.pgmajfault) / dt
+        return snap
+
+
+class DiskCollector(Collector):
+    name = "disk"
+    keys = ("du", "read_mb_s", "write_mb_s", "disks")
+    budget_ms = 3.0
+    # El espacio ocupado cambia despacio; solo las tasas van en cada muestra
+    USAGE_INTERVAL_S = 5.0
+
+    def __init__(self):
+        self.prev_t, self.prev = stamped(psutil.disk_io_counters)
+        self.devices = CounterRates(("read_bytes", "write_bytes"), DiskRate)
+        t, per_disk = stamped(self._per_disk)
+        self.devices.update(per_disk, t)
+        self._du = None
+        self._next_usage = 0.0
+
+    def _per_disk(self):
+        return whole_disks(psutil.disk_io_counters(perdisk=True, nowrap=True) or {})
+
+    def _usage(self):
+        try:
+            return psutil.disk_usage("C:\\")
+        except Exception:
+            return psutil.disk_usage("/")
+
+    def collect(self, now, dt):
+        mono = clock()
+        if self._du is None or mono >= self._next_usage:
+            self._du = self._usage()
+            self._next_usage = mono + self.USAGE_INTERVAL_S
+
+        t, dio = stamped(psutil.disk_io_counters)
+        dt = t - self.prev_t
+        prev, self.prev, self.prev_t = self.prev, dio, t
+        t, per_disk = stamped(self._per_disk)
+        return {
+            'du': self._du,
+            'read_mb_s': rate_mb_s(dio.read_bytes, prev.read_bytes, dt),
+            'write_mb_s': rate_mb_s(dio.write_bytes, prev.write_bytes, dt),
+            'disks': self.devices.update(per_disk, t),
+        }
+
+
+class NetCollector(Collector):
+    name = "net"
+    keys = ("net", "up_mb_s", "down_mb_s", "nics")
+    budget_ms = 3.0
+
+    def __init__(self):
+        self.prev_t, self.prev = stamped(psutil.net_io_counters)
+        self.devices = CounterRates(("bytes_sent", "bytes_recv"), NicRate)
+        t, per_nic = stamped(self._per_nic)
+        self.devices.update(per_nic, t)
+
+    def _per_nic(self):
+        return psutil.net_io_counters(pernic=True, nowrap=True) or {}
+
+    def collect(self, now, dt):
+        t, net = stamped(psutil.net_io_counters)
+        dt = t - self.prev_t
+        prev, self.prev, self.prev_t = self.prev, net, t
+        t, per_nic = stamped(self._per_nic)
+        return {
+            'net': net,
+            'up_mb_s': rate_mb_s(net.bytes_sent, prev.bytes_sent, dt),
+            'down_mb_s': rate_mb_s(net.bytes_recv, prev.bytes_recv, dt),
+            'nics': self.devices.update(per_nic, t),
+        }
+
+
+class GpuCollector(Collector):
+    # get_gpus() solo lee la última tanda del nvidia-smi persistente
+    name = "gpu"
+    keys = ("gpus", "gpu_backend")
+    budget_ms = 1.0
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    def collect(self, now, dt):
+        return {'gpus': self.monitor.get_gpus(), 'gpu_backend': self.monitor.name}
+
+    def close(self):
+        self.monitor.close()
+
+
+class ProcessCollector(Collector):
+    # El número de procesos va en cada muestra; la tabla top-N (la parte más
+    # cara) solo cuando está activada y como mucho cada TABLE_INTERVAL_S
+    name = "procs"
+    keys = ("processes", "top_processes")
+    budget_ms = 50.0
+    TABLE_INTERVAL_S = 2.0
+
+    def __init__(self, top_n=10):
+        self.table = ProcessTable(top_n)
+        self.enabled = False
+        self._top = None
+        self._next_table = 0.0
+
+    def collect(self, now, dt):
+        try:
+            pids = psutil.pids()
+            processes = len(pids)
+        except Exception:
+            pids = None
+            processes = None
+
+        if not self.enabled:
+            self._top = None
+        elif pids is not None:
+            mono = clock()
+            if mono >= self._next_table:
+                self._next_table = mono + self.TABLE_INTERVAL_S
+                self._top = self.table.sample(pids)
+        return {'processes': processes, 'top_processes': self._top}
+
+
+class SystemCollector(Collector):
+    name = "sys"
+    keys = ("boot_time", "os", "host", "user")
+    budget_ms = 1.0
+
+    def __init__(self, facts):
+        self.facts = facts
+
+    def collect(self, now, dt):
+        facts = self.facts
+        facts.check(now, clock())
+        return {'boot_time': facts.boot_time, 'os': facts.os, 'host': facts.host, 'user': facts.user}
@@ -0,0 +1,63 @@
+import re
+from collections import namedtuple
+
+
+DiskRate = namedtuple("DiskRate", "name read_mb_s write_mb_s")
+NicRate = namedtuple("NicRate", "name up_mb_s down_mb_s")
+
+MB = 1024 * 1024
+
+
+def counter_delta(value, prev):
+    # psutil ya corrige los contadores de 32 bits que dan la vuelta
+    # (nowrap=True); si aun así bajan es que el dispositivo se reinició o se
+    # reconectó, y esa muestra cuenta como 0 en lugar de un salto negativo
+    return value - prev if value >= prev else 0
+
+
+class CounterRates:
+    # Tasas por dispositivo a partir de contadores acumulados, en una tabla
+    # indexada por nombre. Un dispositivo nuevo aporta 0 en su primera
+    # muestra y uno que desaparece se borra de la tabla.
+    def __init__(self, fields, row_type):
+        self.fields = fields
+        self.row_type = row_type
+        self._prev = {}
+        self._prev_t = None
+
+    def update(self, counters, t):
+        # t: hora monotónica a la que se leyeron los contadores
+        dt = t - self._prev_t if self._prev_t is not None else 0.0
+        self._prev_t = t
+        rows = []
+        current = {}
+        for name, c in counters.items():
+            values = tuple(getattr(c, field) for field in self.fields)
+            current[name] = values
+            prev = self._prev.get(name)
+            if prev is None or dt <= 0:
+                rates = (0.0,) * len(values)
+            else:
+                rates = tuple(counter_delta(v, p) / MB / dt for v, p in zip(values, prev))
+            rows.append(self.row_type(name, *rates))
+        self._prev = current
+        # Los más activos primero
+        rows.sort(key=lambda row: row[1] + row[2], reverse=True)
+        return rows
+
+
+_PARTITION = re.compile(r"^(.*?\d)p\d+$|^(.*?\D)\d+$")
+
+
+def whole_disks(counters):
+    # En Linux perdisk incluye también las particiones (sda1, nvme0n1p2):
+    # se descartan las que tienen su disco en la misma tabla para no contar
+    # dos veces la misma actividad
+    disks = {}
+    for name, c in counters.items():
+        m = _PARTITION.match(name)
+        parent = m and (m.group(1) or m.group(2))
+        if parent and parent in counters:
+            continue
+        disks[name] = c
+    return disks
@@ -0,0 +1,142 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Exportador local en formato OpenMetrics (lo entiende Prometheus). El texto
+# se genera una vez por muestra en el hilo del muestreador; cada scrape solo
+# devuelve los bytes ya preparados, sin tocar psutil.
+#
+#   python -m Recolector serve --port 9464
+#   curl http://127.0.0.1:9464/metrics
+#
+# Si se le pasa stats (p. ej. Instrumentation.summary), /stats devuelve en
+# JSON los tiempos del propio monitor.
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_PORT = 9464
+MB = 1024 * 1024
+
+# nombre, tipo, ayuda
+METRICS = (
+    ("monitor_cpu_usage_percent", "gauge", "Uso total del CPU"),
+    ("monitor_cpu_core_usage_percent", "gauge", "Uso del CPU por núcleo lógico"),
+    ("monitor_memory_usage_percent", "gauge", "Memoria RAM en uso"),
+    ("monitor_memory_used_bytes", "gauge", "Memoria RAM usada"),
+    ("monitor_swap_used_bytes", "gauge", "Swap usado"),
+    ("monitor_pressure_stall_percent", "gauge", "Tiempo parado por recurso (PSI)"),
+    ("monitor_page_in_bytes_per_second", "gauge", "Paginación de entrada"),
+    ("monitor_page_out_bytes_per_second", "gauge", "Paginación de salida"),
+    ("monitor_swap_in_bytes_per_second", "gauge", "Entrada desde swap"),
+    ("monitor_swap_out_bytes_per_second", "gauge", "Salida a swap"),
+    ("monitor_disk_read_bytes_per_second", "gauge", "Lectura de disco"),
+    ("monitor_disk_write_bytes_per_second", "gauge", "Escritura de disco"),
+    ("monitor_network_transmit_bytes_per_second", "gauge", "Subida de red"),
+    ("monitor_network_receive_bytes_per_second", "gauge", "Bajada de red"),
+    ("monitor_gpu_usage_percent", "gauge", "Uso de la GPU"),
+    ("monitor_sample_timestamp_seconds", "gauge", "Hora de la muestra"),
+)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _samples(snap):
+    vm = snap['vm']
+    yield "monitor_cpu_usage_percent", "", snap['cpu']
+    for i, value in enumerate(snap.get('cpu_per_core') or ()):
+        yield "monitor_cpu_core_usage_percent", f'{{core="{i}"}}', value
+    yield "monitor_memory_usage_percent", "", vm.percent
+    yield "monitor_memory_used_bytes", "", vm.used
+    yield "monitor_swap_used_bytes", "", snap['swap'].used
+    for resource, stall in snap['psi'].items():
+        if stall is not None:
+            yield "monitor_pressure_stall_percent", f'{{resource="{resource}",kind="some"}}', stall.some
+            yield "monitor_pressure_stall_percent", f'{{resource="{resource}",kind="full"}}', stall.full
+    if snap['page_in_mb_s'] is not None:
+        yield "monitor_page_in_bytes_per_second", "", snap['page_in_mb_s'] * MB
+        yield "monitor_page_out_bytes_per_second", "", snap['page_out_mb_s'] * MB
+    yield "monitor_swap_in_bytes_per_second", "", snap['swap_in_mb_s'] * MB
+    yield "monitor_swap_out_bytes_per_second", "", snap['swap_out_mb_s'] * MB
+    yield "monitor_disk_read_bytes_per_second", "", snap['read_mb_s'] * MB
+    yield "monitor_disk_write_bytes_per_second", "", snap['write_mb_s'] * MB
+    yield "monitor_network_transmit_bytes_per_second", "", snap['up_mb_s'] * MB
+    yield "monitor_network_receive_bytes_per_second", "", snap['down_mb_s'] * MB
+    for gpu in snap['gpus']:
+        yield "monitor_gpu_usage_percent", f'{{gpu="{gpu.index}",name="{_label(gpu.name)}"}}', gpu.load * 100
+    yield "monitor_sample_timestamp_seconds", "", snap['time']
+
+
+def render_openmetrics(snap):
+    by_name = {}
+    for name, labels, value in _samples(snap):
+        by_name.setdefault(name, []).append(f"{name}{labels} {float(value)!r}")
+
+    lines = []
+    for name, kind, help_text in METRICS:
+        samples = by_name.get(name)
+        if not samples:
+            continue
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.extend(samples)
+    lines.append("# EOF\n")
+    return "\n".join(lines).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        exporter = self.server.exporter
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = exporter.body
+            if body is None:
+                self.send_error(503, "sin muestras todavía")
+                return
+            self._send(body, CONTENT_TYPE)
+        elif path == "/stats" and exporter.stats is not None:
+            self._send(json.dumps(exporter.stats()).encode("utf-8"), "application/json")
+        else:
+            self.send_error(404)
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    # Servidor HTTP en un hilo aparte. publish() se registra como listener
+    # de MetricSampler; por defecto solo escucha en localhost.
+    def __init__(self, port=DEFAULT_PORT, host="127.0.0.1", stats=None):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.body = None
+        self.server = None
+        self.thread = None
+
+    def publish(self, snap):
+        # Sustituir la referencia es atómico: un scrape ve el texto viejo o el nuevo
+        self.body = render_openmetrics(snap)
+
+    def start(self):
+        if self.server is None:
+            self.server = ThreadingHTTPServer((self.host, self.port), _Handler)
+            self.server.daemon_threads = True
+            self.server.exporter = self
+            # Con port=0 el sistema elige uno libre
+            self.port = self.server.server_address[1]
+            self.thread = threading.Thread(target=self.server.serve_forever, name="MetricsExporter", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
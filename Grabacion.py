@@ -0,0 +1,401 @@
+import argparse
+import builtins
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+import Colectores
+import Presion
+from BackendGPU import GpuInfo, GpuMonitor
+from Recolector import DeadlineTicker, MetricCollector, MetricSampler, snapshot_to_record
+
+# Grabación y reproducción de los contadores crudos que leen los colectores.
+# Se graba el resultado de cada llamada a psutil y a Presion (/proc), y la
+# lista de GPUs, por muestra, no las tasas ya calculadas: al reproducir, los
+# colectores vuelven a calcularlas con los mismos contadores y las mismas
+# marcas de tiempo, así que el resultado es idéntico al de la máquina original.
+#
+#   python -m Grabacion record incidente.mrrec --interval 1 --count 600
+#   python -m Grabacion replay incidente.mrrec --speed 0     # lo más rápido posible
+#   python PanelProcesos.py --replay incidente.mrrec --speed 10
+#
+# Formato: JSON por líneas comprimido con gzip. Cada línea es una muestra
+# {"t": hora, "c": {llamada: resultado}, "m": [lecturas del reloj],
+# "g": gpus, "b": backend, "f": datos del sistema}; la primera ("t": null)
+# son las llamadas hechas al crear los colectores. "f" (equipo, SO, usuario,
+# núcleos, boot_time de SystemFacts) solo va en la línea inicial y en las
+# que cambia. Las horas de cada lectura de contadores
+# (Colectores.clock) se guardan en orden, así que las tasas salen iguales
+# aunque la reproducción vaya a otra velocidad. Los
+# namedtuple se guardan como {"~": tipo, "v": [...]} y sus campos se
+# declaran una vez en "types". La tabla de procesos no se graba.
+
+FORMAT = "mrrec1"
+RECORDED_CALLS = ("cpu_count", "boot_time", "cpu_percent", "cpu_freq", "virtual_memory", "swap_memory",
+                  "disk_usage", "disk_io_counters", "net_io_counters", "pids")
+# Lecturas de /proc de PressureCollector (PSI y vmstat)
+RECORDED_PRESION = ("read_psi", "read_vmstat")
+# Atributos de SystemFacts: el SO, el equipo y el usuario no salen de psutil
+RECORDED_FACTS = ("cores_physical", "cores_logical", "os", "host", "boot_time", "user")
+KNOWN_TYPES = {"GpuInfo": GpuInfo}
+
+_MISSING = object()
+
+
+def recorded_functions():
+    for name in RECORDED_CALLS:
+        yield psutil, name
+    for name in RECORDED_PRESION:
+        yield Presion, name
+
+
+def call_key(name, args, kwargs):
+    return name + json.dumps([args, kwargs], sort_keys=True, separators=(',', ':'))
+
+
+class _Raised:
+    # Excepción grabada (p. ej. disk_usage("C:\\") en Linux)
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def error(self):
+        cls = getattr(psutil, self.name, None) or getattr(builtins, self.name, None)
+        if not (isinstance(cls, type) and issubclass(cls, Exception)):
+            cls = OSError
+        return cls()
+
+
+class Recorder:
+    # Sustituye las funciones de psutil por versiones que anotan su resultado
+    # y escribe una línea por muestra del colector envuelto con wrap()
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self._encode_json = json.JSONEncoder(separators=(',', ':')).encode
+        self._types = set()
+        self._new_types = {}
+        self._calls = {}
+        self._clock = []
+        self._facts = None
+        self._facts_written = None
+        self._lock = threading.Lock()
+        self._originals = {}
+        self.frames = 0
+        for module, name in recorded_functions():
+            func = getattr(module, name)
+            self._originals[module, name] = func
+            setattr(module, name, self._wrap(name, func))
+        self._clock_func = Colectores.clock
+        Colectores.clock = self._read_clock
+        self.file.write(self._encode_json({"format": FORMAT}) + "\n")
+
+    def _wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            key = call_key(name, args, kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._calls[key] = {"!": type(e).__name__}
+                raise
+            self._calls[key] = self._encode(result)
+            return result
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _read_clock(self):
+        t = self._clock_func()
+        self._clock.append(t)
+        return t
+
+    def _encode(self, value):
+        if isinstance(value, tuple) and hasattr(value, "_fields"):
+            name = type(value).__name__
+            if name not in self._types:
+                self._types.add(name)
+                self._new_types[name] = list(value._fields)
+            return {"~": name, "v": [self._encode(v) for v in value]}
+        if isinstance(value, dict):
+            return {k: self._encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        return value
+
+    def _write(self, t, snap):
+        frame = {"t": t, "c": self._calls, "m": self._clock}
+        if snap is not None:
+            frame["g"] = self._encode(snap['gpus'])
+            frame["b"] = snap['gpu_backend']
+        if self._facts is not None:
+            facts = {name: getattr(self._facts, name) for name in RECORDED_FACTS}
+            if facts != self._facts_written:
+                frame["f"] = self._facts_written = facts
+        if self._new_types:
+            frame["types"] = self._new_types
+            self._new_types = {}
+        self._calls = {}
+        self._clock = []
+        with self._lock:
+            if self.file is not None:
+                self.file.write(self._encode_json(frame) + "\n")
+                self.frames += 1
+
+    def wrap(self, collector):
+        # Llamar justo después de crear el colector: lo leído hasta ahora
+        # (núcleos, boot_time, contadores iniciales) va en la línea inicial
+        collector.registry.start()
+        self._facts = collector.facts
+        self._write(None, None)
+        sample = collector.sample
+
+        def recorded_sample(now=None):
+            now = time.time() if now is None else now
+            snap = sample(now)
+            self._write(now, snap)
+            return snap
+        collector.sample = recorded_sample
+        return collector
+
+    def close(self):
+        with self._lock:
+            for (module, name), func in self._originals.items():
+                setattr(module, name, func)
+            Colectores.clock = self._clock_func
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class ReplayGpu:
+    # Backend de GPU que devuelve la lista grabada en la muestra actual
+    def __init__(self, replay):
+        self.replay = replay
+
+    @property
+    def name(self):
+        return self.replay.frame.get("b")
+
+    def get_gpus(self):
+        return list(self.replay.frame.get("g") or ())
+
+    def close(self):
+        pass
+
+
+class Replay:
+    # Lee una grabación muestra a muestra y hace que psutil devuelva lo
+    # grabado. Una llamada que no está en la muestra actual usa su último
+    # valor grabado, y una que nunca se grabó va al psutil real. El reloj de
+    # los colectores devuelve las lecturas grabadas en el mismo orden.
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "rt", encoding="utf-8")
+        header = json.loads(self.file.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path}: formato desconocido")
+        self._types = dict(KNOWN_TYPES)
+        self.last = {}
+        self.frame = {}
+        self.frames = 0
+        self.facts = None
+        self._ticks = iter(())
+        self._tick = 0.0
+        self._next = self._read()
+        self._originals = {}
+        for module, name in recorded_functions():
+            func = getattr(module, name)
+            self._originals[module, name] = func
+            setattr(module, name, self._replayed(name, func))
+        self._clock_func = Colectores.clock
+        Colectores.clock = self._replayed_clock
+
+    def _replayed_clock(self):
+        # Si se acaban las lecturas grabadas (otro código) se repite la última
+        self._tick = next(self._ticks, self._tick)
+        return self._tick
+
+    def _read(self):
+        line = self.file.readline()
+        if not line:
+            return None
+        frame = json.loads(line)
+        for name, fields in frame.pop("types", {}).items():
+            if name not in self._types:
+                self._types[name] = namedtuple(name, fields)
+        frame["c"] = {key: self._decode(v) for key, v in frame["c"].items()}
+        if "g" in frame:
+            frame["g"] = self._decode(frame["g"])
+        return frame
+
+    def _decode(self, value):
+        if isinstance(value, dict):
+            if "~" in value:
+                return self._types[value["~"]](*(self._decode(v) for v in value["v"]))
+            if "!" in value:
+                return _Raised(value["!"])
+            return {k: self._decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
+
+    def _replayed(self, name, func):
+        def wrapper(*args, **kwargs):
+            key = call_key(name, args, kwargs)
+            value = self.frame.get("c", {}).get(key, _MISSING)
+            if value is _MISSING:
+                value = self.last.get(key, _MISSING)
+            if value is _MISSING:
+                return func(*args, **kwargs)
+            if isinstance(value, _Raised):
+                raise value.error()
+            return value
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def advance(self):
+        # Pasa a la siguiente muestra; False al final de la grabación
+        if self._next is None:
+            return False
+        self.last.update(self.frame.get("c", {}))
+        self.frame = self._next
+        self._ticks = iter(self.frame.get("m", ()))
+        self._next = self._read()
+        self.frames += 1
+        if self.facts is not None:
+            self._restore_facts()
+        return True
+
+    def _restore_facts(self):
+        for name, value in self.frame.get("f", {}).items():
+            setattr(self.facts, name, value)
+
+    def next_time(self):
+        return None if self._next is None else self._next["t"]
+
+    def collector(self, top_n=10):
+        # MetricCollector creado con la línea inicial de la grabación
+        self.advance()
+        collector = MetricCollector(GpuMonitor([ReplayGpu(self)]), top_n=top_n)
+        # Los datos del sistema son los de la máquina grabada: se restauran
+        # de la grabación y no se comprueban aquí (live = False)
+        collector.facts.live = False
+        self.facts = collector.facts
+        self._restore_facts()
+        collector.registry.start()
+        return ReplayCollector(self, collector)
+
+    def close(self):
+        for (module, name), func in self._originals.items():
+            setattr(module, name, func)
+        Colectores.clock = self._clock_func
+        self.file.close()
+
+
+class ReplayCollector:
+    # Se usa como un MetricCollector: cada sample() avanza una muestra y la
+    # calcula con la hora grabada. Al acabar la grabación lanza EOFError.
+    # processes_enabled se queda en este objeto: la tabla de procesos no se
+    # graba y no debe mezclar procesos de esta máquina.
+    def __init__(self, replay, collector):
+        self.replay = replay
+        self.collector = collector
+
+    def __getattr__(self, name):
+        return getattr(self.collector, name)
+
+    def sample(self):
+        if not self.replay.advance():
+            raise EOFError("fin de la grabación")
+        return self.collector.sample(self.replay.frame["t"])
+
+    def close(self):
+        self.collector.close()
+        self.replay.close()
+
+
+class ReplaySchedule:
+    # Intervalo del muestreador en reproducción: la separación grabada
+    # entre muestras dividida por speed (0 = sin esperas)
+    def __init__(self, replay, speed=1.0):
+        self.replay = replay
+        self.speed = speed
+        self.state = None
+
+    def next(self, snap):
+        t = self.replay.next_time()
+        if t is None or not self.speed:
+            return 0.0
+        return max(0.0, (t - snap['time']) / self.speed)
+
+
+def record(path, interval, count=None, top=0):
+    recorder = Recorder(path)
+    collector = recorder.wrap(MetricCollector(top_n=top))
+    collector.processes_enabled = top > 0
+    ticker = DeadlineTicker()
+    try:
+        while count is None or recorder.frames - 1 < count:
+            collector.sample()
+            if count is None or recorder.frames - 1 < count:
+                time.sleep(ticker.wait_time(interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.close()
+        recorder.close()
+    print(f"{recorder.frames - 1} muestras en {path}", file=sys.stderr)
+
+
+def replay(path, speed=0.0, output=None):
+    # Reproduce sin interfaz con el mismo MetricSampler que usa el widget;
+    # opcionalmente escribe cada muestra como JSONL para comparar
+    rep = Replay(path)
+    sampler = MetricSampler(collector=rep.collector(), schedule=ReplaySchedule(rep, speed))
+    if output is not None:
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        sampler.listeners.append(lambda snap: output.write(encode(snapshot_to_record(snap)) + "\n"))
+    t0 = time.perf_counter()
+    sampler.start()
+    sampler.thread.join()
+    elapsed = time.perf_counter() - t0
+    frames = rep.frames - 1
+    print(f"{frames} muestras en {elapsed:.2f} s ({frames / max(elapsed, 1e-9):.0f} muestras/s)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Grabacion", description="Graba y reproduce contadores crudos")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_record = sub.add_parser("record", help="graba muestras en un archivo .mrrec")
+    p_record.add_argument("path")
+    p_record.add_argument("--interval", type=float, default=1.0, help="segundos entre muestras (por defecto 1.0)")
+    p_record.add_argument("--count", type=int, default=None, help="número de muestras antes de salir")
+    p_record.add_argument("--top", type=int, default=0, help="activa la tabla de procesos (no se graba)")
+
+    p_replay = sub.add_parser("replay", help="reproduce una grabación sin interfaz")
+    p_replay.add_argument("path")
+    p_replay.add_argument("--speed", type=float, default=0.0, help="1 = tiempo real, 0 = lo más rápido posible")
+    p_replay.add_argument("--output", default=None, help="archivo JSONL con las muestras reproducidas ('-' para stdout)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.path, args.interval, args.count, args.top)
+    elif args.output is None:
+        replay(args.path, args.speed)
+    elif args.output == "-":
+        replay(args.path, args.speed, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            replay(args.path, args.speed, output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
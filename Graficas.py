@@ -0,0 +1,174 @@
+import numpy as np
+
+import matplotlib.style as style
+style.use('dark_background')  # Tema oscuro
+
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+BG_COLOR = '#2b2b2b'
+
+
+class LineChart:
+    # Base de TimeChart y HeatmapChart: figura que se crea una sola vez; las
+    # subclases actualizan sus artistas con set_data y llaman a blit(), que
+    # pinta sobre un fondo cacheado. El eje Y solo se reescala
+    # (y se redibuja la figura completa) cuando los datos salen del rango.
+    def __init__(self, master, lines, points, figsize, dpi, title=None, ylabel=None,
+                 ylim=None, legend=False, axes=True, min_span=0.01):
+        self.points = points
+        self.fixed_ylim = ylim
+        self.min_span = min_span
+        self._background = None
+
+        self.fig = Figure(figsize=figsize, dpi=dpi, facecolor=BG_COLOR)
+        self.fig.patch.set_facecolor(BG_COLOR)
+        self.ax = self.fig.add_subplot(111, facecolor=BG_COLOR)
+
+        # animated=True deja las líneas fuera del fondo cacheado
+        self.lines = []
+        for color, label in lines:
+            line, = self.ax.plot([], [], color=color, linewidth=2, label=label, animated=True)
+            self.lines.append(line)
+        self.artists = list(self.lines)
+
+        self.ax.set_xlim(0, points - 1)
+        self.ax.set_ylim(*(ylim or (0, 1)))
+        if axes:
+            if title:
+                self.ax.set_title(title, color='white', fontsize=12)
+            if ylabel:
+                self.ax.set_ylabel(ylabel, color='white')
+            self.ax.grid(True, alpha=0.3, color='white')
+            self.ax.tick_params(colors='white')
+        else:
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+        if legend:
+            self.ax.legend(loc="upper left")
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        # Tras cada dibujo completo (inicio, redimensionado, reescalado) se
+        # guarda el fondo y se pintan las líneas encima
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def _rescale(self, series):
+        if self.fixed_ylim is not None:
+            return False
+        series = [y for y in series if len(y)]
+        if not series:
+            return False
+        lo = min(float(np.min(y)) for y in series)
+        hi = max(float(np.max(y)) for y in series)
+        span = max(hi - lo, self.min_span)
+
+        lo0, hi0 = self.ax.get_ylim()
+        # Histéresis: se mantiene el rango mientras los datos quepan y ocupen al menos la mitad
+        if lo >= lo0 and hi <= hi0 and span >= 0.5 * (hi0 - lo0):
+            return False
+
+        pad = span * 0.1
+        self.ax.set_ylim(lo - pad, lo + span + pad)
+        return True
+
+    def memory_bytes(self):
+        # Estimación en RGBA: buffer de Agg, fondo cacheado e imagen de Tk
+        w, h = self.canvas.get_width_height()
+        return w * h * 4 * 3
+
+    def blit(self, series):
+        if self._rescale(series) or self._background is None:
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self._background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+
+def _format_ago(seconds, pos=None):
+    seconds = -seconds
+    if seconds >= 3600:
+        return f"-{seconds / 3600:g}h"
+    if seconds >= 60:
+        return f"-{seconds / 60:g}m"
+    return f"-{seconds:g}s" if seconds else "0"
+
+
+class TimeChart(LineChart):
+    # Gráfica grande con eje X en segundos hacia atrás desde la última
+    # muestra. Con datos agregados dibuja además el mínimo y el máximo de
+    # cada cubeta como líneas tenues.
+    def __init__(self, master, lines, span, figsize, dpi, **kwargs):
+        super().__init__(master, lines, 2, figsize, dpi, **kwargs)
+        self.envelopes = []
+        for line in self.lines:
+            pair = [self.ax.plot([], [], color=line.get_color(), linewidth=1, alpha=0.35, animated=True)[0]
+                    for _ in range(2)]
+            self.envelopes.append(pair)
+            self.artists.extend(pair)
+        self.ax.xaxis.set_major_formatter(FuncFormatter(_format_ago))
+        self.set_span(span)
+
+    def set_span(self, seconds):
+        # Cambiar de rango obliga a redibujar ejes y fondo
+        self.span = seconds
+        self.ax.set_xlim(-seconds, 0)
+        self._background = None
+
+    def update(self, series, x, envelopes=None):
+        envelopes = envelopes or [None] * len(series)
+        bounds = list(series)
+        for line, pair, y, env in zip(self.lines, self.envelopes, series, envelopes):
+            line.set_data(x, y)
+            if env is None:
+                pair[0].set_data([], [])
+                pair[1].set_data([], [])
+            else:
+                pair[0].set_data(x, env[0])
+                pair[1].set_data(x, env[1])
+                bounds.extend(env)
+        self.blit(bounds)
+
+
+class HeatmapChart(LineChart):
+    # Mapa de calor filas × tiempo (p. ej. uso por núcleo) dibujado como un
+    # único AxesImage que se actualiza con set_data: el coste por tick no
+    # depende del número de filas, como pasaría con una línea por núcleo.
+    def __init__(self, master, rows, points, figsize, dpi, title=None, ylabel=None, vmax=100):
+        super().__init__(master, [], points, figsize, dpi, title=title, ylabel=ylabel,
+                         ylim=(-0.5, rows - 0.5))
+        self.rows = rows
+        self._frame = np.zeros((rows, points))
+        self.image = self.ax.imshow(self._frame, aspect='auto', cmap='inferno', vmin=0, vmax=vmax,
+                                    interpolation='nearest', origin='lower', animated=True,
+                                    extent=(-0.5, points - 0.5, -0.5, rows - 0.5))
+        self.artists.append(self.image)
+        self.ax.grid(False)
+        self.ax.set_xticks([])
+
+    def set_rows(self, rows):
+        # Otro número de filas (p. ej. al cambiar de equipo): nuevo marco y
+        # redibujo completo de ejes y fondo
+        self.rows = rows
+        self._frame = np.zeros((rows, self.points))
+        self.image.set_extent((-0.5, self.points - 0.5, -0.5, rows - 0.5))
+        self.fixed_ylim = (-0.5, rows - 0.5)
+        self.ax.set_ylim(*self.fixed_ylim)
+        self._background = None
+
+    def update(self, matrix):
+        # Las columnas nuevas entran por la derecha; lo que falta queda a 0
+        n = min(matrix.shape[1], self.points)
+        self._frame[:, :self.points - n] = 0
+        self._frame[:, self.points - n:] = matrix[:self.rows, matrix.shape[1] - n:]
+        self.image.set_data(self._frame)
+        self.blit(())
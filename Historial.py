@@ -0,0 +1,336 @@
+import os
+
+import numpy as np
+
+
+class TimeSeries:
+    # Buffer circular de capacidad fija con columnas de tiempo y valor.
+    # Cada muestra se escribe dos veces (en i y en i + capacity) para que la
+    # ventana ordenada siempre sea un slice contiguo: values() y times()
+    # devuelven vistas sin copiar ni reordenar.
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._t = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._v = np.zeros(2 * self.capacity, dtype=dtype)
+        self._head = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, t, value):
+        i = self._head
+        j = i + self.capacity
+        self._t[i] = self._t[j] = t
+        self._v[i] = self._v[j] = value
+        self._head = (i + 1) % self.capacity
+        if self._len < self.capacity:
+            self._len += 1
+
+    def extend(self, times, values):
+        # Escritura vectorizada de un bloque (misma doble escritura que append)
+        times = np.asarray(times, dtype=np.float64)[-self.capacity:]
+        values = np.asarray(values)[-self.capacity:]
+        n = len(times)
+        if not n:
+            return
+        idx = (self._head + np.arange(n)) % self.capacity
+        self._t[idx] = self._t[idx + self.capacity] = times
+        self._v[idx] = self._v[idx + self.capacity] = values
+        self._head = (self._head + n) % self.capacity
+        self._len = min(self._len + n, self.capacity)
+
+    def clear(self):
+        self._head = 0
+        self._len = 0
+
+    def _window(self, n):
+        n = self._len if n is None else min(int(n), self._len)
+        end = self._head + self.capacity
+        return end - n, end
+
+    def values(self, n=None):
+        # Últimos n valores en orden cronológico (vista de solo lectura)
+        start, end = self._window(n)
+        view = self._v[start:end]
+        view.flags.writeable = False
+        return view
+
+    def times(self, n=None):
+        start, end = self._window(n)
+        view = self._t[start:end]
+        view.flags.writeable = False
+        return view
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MatrixSeries(TimeSeries):
+    # Como TimeSeries, pero cada muestra es un vector (p. ej. un valor por
+    # núcleo). Se guarda como matriz filas × tiempo y values() devuelve la
+    # vista filas × n sin copiar.
+    def __init__(self, rows, capacity, dtype=np.float64):
+        super().__init__(capacity, dtype)
+        self.rows = int(rows)
+        self._v = np.zeros((self.rows, 2 * self.capacity), dtype=dtype)
+
+    def append(self, t, column):
+        column = np.asarray(column)[:self.rows]
+        rows = len(column)
+        i = self._head
+        j = i + self.capacity
+        self._t[i] = self._t[j] = t
+        self._v[:rows, i] = column
+        self._v[:rows, j] = column
+        self._head = (i + 1) % self.capacity
+        if self._len < self.capacity:
+            self._len += 1
+
+    def values(self, n=None):
+        start, end = self._window(n)
+        view = self._v[:, start:end]
+        view.flags.writeable = False
+        return view
+
+
+class RingFile(TimeSeries):
+    # TimeSeries respaldada por un archivo memory-mapped de tamaño fijo, para
+    # que el historial sobreviva al cierre del widget. Formato:
+    #   cabecera de 64 bytes: magic (8) + capacity, head, len (uint64)
+    #   tiempos: 2*capacity float64 | valores: 2*capacity float64
+    # Se conserva la escritura doble de TimeSeries, así que las lecturas
+    # siguen siendo vistas del mapa sin copiar.
+    MAGIC = b"MRRING01"
+    HEADER_SIZE = 64
+    FLUSH_EVERY = 60
+
+    def __init__(self, path, capacity):
+        self.capacity = int(capacity)
+        self.path = path
+        column = 2 * self.capacity * 8
+        size = self.HEADER_SIZE + 2 * column
+
+        mode = "w+"
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            with open(path, "rb") as f:
+                header = f.read(16)
+            if header[:8] == self.MAGIC and int.from_bytes(header[8:16], "little") == self.capacity:
+                mode = "r+"
+
+        self._mm = np.memmap(path, dtype=np.uint8, mode=mode, shape=(size,))
+        self._meta = self._mm[8:32].view("<u8")
+        self._t = self._mm[self.HEADER_SIZE:self.HEADER_SIZE + column].view("<f8")
+        self._v = self._mm[self.HEADER_SIZE + column:].view("<f8")
+        if mode == "w+":
+            self._mm[:8] = np.frombuffer(self.MAGIC, dtype=np.uint8)
+            self._meta[:] = (self.capacity, 0, 0)
+        self._pending = 0
+
+    # head y len viven en la cabecera del archivo
+    @property
+    def _head(self):
+        return int(self._meta[1])
+
+    @_head.setter
+    def _head(self, value):
+        self._meta[1] = value
+
+    @property
+    def _len(self):
+        return int(self._meta[2])
+
+    @_len.setter
+    def _len(self, value):
+        self._meta[2] = value
+
+    def append(self, t, value):
+        super().append(t, value)
+        self._pending += 1
+        if self._pending >= self.FLUSH_EVERY:
+            self.flush()
+
+    def extend(self, times, values):
+        super().extend(times, values)
+        self.flush()
+
+    def flush(self):
+        self._mm.flush()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+
+
+def history_dir():
+    return os.path.join(os.path.expanduser("~"), ".monitorecursos", "historial")
+
+
+class RollupTier:
+    # Agregado min/avg/max por cubetas de bucket_s segundos. La cubeta abierta
+    # se acumula en escalares y solo se escribe al cerrarse, así que cada
+    # muestra cuesta O(1). series son las tres series (lo, avg, hi) ya
+    # abiertas, p. ej. RingFile para que el nivel sobreviva al cierre; por
+    # defecto van en memoria.
+    def __init__(self, bucket_s, capacity, series=None):
+        self.bucket_s = bucket_s
+        self.lo, self.avg, self.hi = series or (TimeSeries(capacity), TimeSeries(capacity), TimeSeries(capacity))
+        self._bucket = None
+        self._n = 0
+        self._sum = 0.0
+        self._min = 0.0
+        self._max = 0.0
+
+    def add(self, t, value):
+        bucket = t - t % self.bucket_s
+        if bucket != self._bucket:
+            if self._n:
+                self._close()
+            self._bucket = bucket
+            self._n = 0
+            self._sum = 0.0
+            self._min = value
+            self._max = value
+        self._n += 1
+        self._sum += value
+        if value < self._min:
+            self._min = value
+        elif value > self._max:
+            self._max = value
+
+    def _close(self):
+        self.lo.append(self._bucket, self._min)
+        self.avg.append(self._bucket, self._sum / self._n)
+        self.hi.append(self._bucket, self._max)
+
+    def resume(self, times, values):
+        # Al arrancar: continúa desde las cubetas ya guardadas agregando solo
+        # las muestras crudas posteriores a la última cerrada (todas si el
+        # nivel está vacío). Sin niveles guardados es una reconstrucción
+        # completa y vectorizada.
+        if not len(self.lo) == len(self.avg) == len(self.hi):
+            # Escritura a medias (p. ej. el sistema se cayó): se rehace
+            self.lo.clear()
+            self.avg.clear()
+            self.hi.clear()
+        self._bucket = None
+        self._n = 0
+        if len(self.avg):
+            start = int(np.searchsorted(times, self.avg.times(1)[0] + self.bucket_s))
+            times = times[start:]
+            values = values[start:]
+        if not len(times):
+            return
+
+        buckets = times - times % self.bucket_s
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(values)])
+        sums = np.add.reduceat(values, starts)
+        mins = np.minimum.reduceat(values, starts)
+        maxs = np.maximum.reduceat(values, starts)
+
+        # Todas las cubetas menos la última están cerradas
+        closed = len(starts) - 1
+        self.lo.extend(buckets[starts[:closed]], mins[:closed])
+        self.avg.extend(buckets[starts[:closed]], sums[:closed] / counts[:closed])
+        self.hi.extend(buckets[starts[:closed]], maxs[:closed])
+
+        self._bucket = buckets[starts[-1]]
+        self._n = int(counts[-1])
+        self._sum = float(sums[-1])
+        self._min = float(mins[-1])
+        self._max = float(maxs[-1])
+
+
+# Cubetas (segundos) y capacidad de cada nivel. El de 1 s cubre la última
+# hora (el muestreo puede ir a varias muestras por segundo con la vista
+# expandida); el resto, 24 h.
+ROLLUP_TIERS = ((1, 3600), (10, 8640), (60, 1440), (600, 144))
+# Máximo de puntos que se dibujan en una gráfica grande
+MAX_CHART_POINTS = 720
+
+
+class RollupSeries:
+    # Serie cruda (1 s) más sus niveles agregados, mantenidos al vuelo. Se
+    # usa igual que una TimeSeries; window() elige el nivel que corresponde
+    # al rango pedido.
+    def __init__(self, raw, tiers=ROLLUP_TIERS, tier_series=None):
+        self.raw = raw
+        tier_series = tier_series or [None] * len(tiers)
+        self.tiers = [RollupTier(bucket_s, capacity, series)
+                      for (bucket_s, capacity), series in zip(tiers, tier_series)]
+        times = raw.times()
+        values = raw.values()
+        for tier in self.tiers:
+            tier.resume(times, values)
+
+    def _all_series(self):
+        yield self.raw
+        for tier in self.tiers:
+            yield from (tier.lo, tier.avg, tier.hi)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def append(self, t, value):
+        self.raw.append(t, value)
+        for tier in self.tiers:
+            tier.add(t, value)
+
+    def values(self, n=None):
+        return self.raw.values(n)
+
+    def times(self, n=None):
+        return self.raw.times(n)
+
+    def flush(self):
+        for series in self._all_series():
+            series.flush()
+
+    def close(self):
+        for series in self._all_series():
+            series.close()
+
+    def window(self, seconds, now):
+        # Devuelve (tiempos, avg, min, max) del primer nivel que cubre el
+        # rango con como mucho MAX_CHART_POINTS puntos. En el nivel crudo
+        # min y max son None.
+        start = now - seconds
+        times = self.raw.times()
+        i = int(np.searchsorted(times, start))
+        if len(times) - i <= MAX_CHART_POINTS:
+            return times[i:], self.raw.values()[i:], None, None
+
+        for tier in self.tiers:
+            times = tier.avg.times()
+            i = int(np.searchsorted(times, start))
+            if len(times) - i <= MAX_CHART_POINTS or tier is self.tiers[-1]:
+                return times[i:], tier.avg.values()[i:], tier.lo.values()[i:], tier.hi.values()[i:]
+
+
+def open_history(keys, capacity, directory=None, tiers=ROLLUP_TIERS):
+    # Un RingFile por métrica y otros tres (min/avg/max) por nivel agregado,
+    # p. ej. cpu.ring y cpu.600s.avg.ring: al reabrir, los niveles siguen
+    # cubriendo 24 h aunque el crudo cubra menos. Si el disco no está
+    # disponible se usa memoria.
+    directory = directory or history_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        files = {}
+        for key in keys:
+            raw = RingFile(os.path.join(directory, f"{key}.ring"), capacity)
+            tier_series = [tuple(RingFile(os.path.join(directory, f"{key}.{bucket_s}s.{part}.ring"), tier_capacity)
+                                 for part in ("min", "avg", "max"))
+                           for bucket_s, tier_capacity in tiers]
+            files[key] = raw, tier_series
+    except (OSError, ValueError):
+        return memory_history(keys, capacity, tiers)
+    return {key: RollupSeries(raw, tiers, tier_series) for key, (raw, tier_series) in files.items()}
+
+
+def memory_history(keys, capacity, tiers=ROLLUP_TIERS):
+    # Historial solo en memoria (reproducciones, pruebas)
+    return {key: RollupSeries(TimeSeries(capacity), tiers) for key in keys}
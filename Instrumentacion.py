@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+import numpy as np
+import psutil
+
+# Tiempos del propio widget: cada medida va a un buffer circular con las
+# últimas WINDOW duraciones y los percentiles solo se calculan al consultar
+# (overlay, /stats), así que registrar cuesta O(1).
+WINDOW = 512
+# Llamadas a psutil que se cronometran en modo depuración
+PSUTIL_CALLS = ("cpu_percent", "cpu_freq", "virtual_memory", "swap_memory", "disk_usage",
+                "disk_io_counters", "net_io_counters", "pids")
+# El uso de CPU/RAM propio se lee como mucho una vez por segundo
+OWN_USAGE_INTERVAL_S = 1.0
+MB = 1024 * 1024
+
+
+class RollingStats:
+    __slots__ = ("_v", "_i", "count", "last")
+
+    def __init__(self, size=WINDOW):
+        self._v = np.zeros(size)
+        self._i = 0
+        self.count = 0
+        self.last = 0.0
+
+    def add(self, ms):
+        self._v[self._i] = ms
+        self._i = (self._i + 1) % len(self._v)
+        self.count += 1
+        self.last = ms
+
+    def percentiles(self):
+        n = min(self.count, len(self._v))
+        if not n:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(self._v[:n], (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+
+class Instrumentation:
+    # Registro de tiempos por nombre ("tick", "render", "colector.cpu",
+    # "psutil.pids", "canvas.draw"...). Se escribe desde el hilo del
+    # muestreador y desde el de Tk.
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Contadores que se leen al consultar: {nombre: función sin argumentos}
+        self.gauges = {}
+        # Resumen por colector (CollectorRegistry.summary): errores y lecturas fuera de presupuesto
+        self.collectors = None
+        # Tiempo de canvas.draw/blit acumulado en el render en curso (hilo de Tk)
+        self.chart_ms = 0.0
+        self._process = None
+        self._own = None
+        self._own_time = 0.0
+
+    def record(self, name, ms):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = RollingStats()
+            stats.add(ms)
+
+    def own_usage(self):
+        # RSS (MB) y % de CPU del propio proceso
+        now = time.monotonic()
+        if self._own is None or now - self._own_time >= OWN_USAGE_INTERVAL_S:
+            try:
+                if self._process is None:
+                    self._process = psutil.Process(os.getpid())
+                    self._process.cpu_percent(None)
+                with self._process.oneshot():
+                    self._own = (self._process.memory_info().rss / MB, self._process.cpu_percent(None))
+            except psutil.Error:
+                self._own = (0.0, 0.0)
+            self._own_time = now
+        return self._own
+
+    def summary(self):
+        with self._lock:
+            items = [(name, stats.count, stats.last, stats.percentiles()) for name, stats in self._stats.items()]
+        rss_mb, cpu = self.own_usage()
+        return {
+            'timings': {
+                name: {'count': count, 'last_ms': last, 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+                for name, count, last, (p50, p95, p99) in sorted(items)
+            },
+            'gauges': {name: read() for name, read in self.gauges.items()},
+            'collectors': self.collectors() if self.collectors is not None else {},
+            'rss_mb': rss_mb,
+            'cpu_percent': cpu,
+        }
+
+
+def _timed_call(instr, name, func, chart=False):
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            if chart:
+                instr.chart_ms += ms
+            instr.record(name, ms)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def instrument_psutil(instr, names=PSUTIL_CALLS):
+    # Solo en modo depuración: sustituye las funciones del módulo psutil
+    # (los colectores las llaman a través del módulo) por versiones cronometradas
+    for name in names:
+        func = getattr(psutil, name)
+        if not hasattr(func, "__wrapped__"):
+            setattr(psutil, name, _timed_call(instr, f"psutil.{name}", func))
+
+
+def instrument_canvas(instr):
+    # Igual para los dibujos de Matplotlib; además acumula en chart_ms para
+    # separar el tiempo de gráficas del de etiquetas en cada render
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    for method in ("draw", "blit"):
+        func = getattr(FigureCanvasTkAgg, method)
+        if not hasattr(func, "__wrapped__"):
+            setattr(FigureCanvasTkAgg, method, _timed_call(instr, f"canvas.{method}", func, chart=True))
+
+
+def format_summary(summary):
+    # Texto del overlay: una línea por medida
+    lines = [f"{'':<22}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+    for name, t in summary['timings'].items():
+        lines.append(f"{name[:22]:<22}{t['p50_ms']:7.2f}{t['p95_ms']:7.2f}{t['p99_ms']:7.2f}")
+    for name, value in summary.get('gauges', {}).items():
+        lines.append(f"{name[:22]:<22}{value:>7}")
+    for name, c in summary.get('collectors', {}).items():
+        if c['errors'] or c['over_budget']:
+            lines.append(f"{name[:10]:<10} err {c['errors']}  lentas {c['over_budget']}/{c['runs']} (>{c['budget_ms']:g} ms)")
+    lines.append(f"RSS {summary['rss_mb']:.1f} MB   CPU {summary['cpu_percent']:.1f} %")
+    return "\n".join(lines)
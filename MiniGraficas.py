@@ -0,0 +1,75 @@
+import tkinter as tk
+
+import numpy as np
+
+# Mini-gráficas de los paneles compactos dibujadas directamente en un
+# tk.Canvas: una polilínea (y opcionalmente su relleno y los marcadores de
+# mínimo y máximo) cuyas coordenadas se sustituyen en cada tick. No carga
+# Matplotlib ni rasteriza una figura; el modo compacto no necesita nada más.
+
+BG_COLOR = '#2b2b2b'
+# Proporción del color de la línea en el relleno (Tk no tiene transparencia)
+FILL_MIX = 0.25
+MARKER_R = 2
+PAD = 4
+
+
+def _mix(canvas, color, bg, amount):
+    # Color intermedio entre color y bg en formato #rrggbb
+    fg = canvas.winfo_rgb(color)
+    back = canvas.winfo_rgb(bg)
+    r, g, b = (int((f * amount + k * (1 - amount)) / 256) for f, k in zip(fg, back))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+class Sparkline:
+    # Misma interfaz que tenían las mini-gráficas de Matplotlib: widget para
+    # empaquetar y update([valores]). El eje Y se ajusta a los datos visibles
+    # en cada update (es solo aritmética sobre points valores).
+    def __init__(self, master, color, points, width=280, height=49, fill=True, markers=True,
+                 bg=BG_COLOR, min_span=0.01):
+        self.points = points
+        self.width = width
+        self.height = height
+        self.min_span = min_span
+        self.canvas = tk.Canvas(master, width=width, height=height, bg=bg, highlightthickness=0)
+        self.widget = self.canvas
+        # Posiciones X fijas: el punto más reciente siempre a la derecha
+        self._x = np.linspace(PAD, width - PAD, points)
+
+        self.fill = None
+        if fill:
+            self.fill = self.canvas.create_polygon(0, 0, 0, 0, 0, 0, fill=_mix(self.canvas, color, bg, FILL_MIX),
+                                                   outline="", state="hidden")
+        self.line = self.canvas.create_line(0, 0, 0, 0, fill=color, width=2, state="hidden")
+        self.markers = ()
+        if markers:
+            self.markers = tuple(self.canvas.create_oval(0, 0, 0, 0, fill=c, outline="", state="hidden")
+                                 for c in ("gray60", "white"))
+        self._hidden = [item for item in (self.fill, self.line) + self.markers if item is not None]
+
+    def coords(self, y):
+        # Coordenadas de la polilínea para los últimos points valores de y,
+        # e índices del mínimo y el máximo entre ellos
+        y = np.asarray(y, dtype=float)[-self.points:]
+        lo = float(y.min())
+        span = max(float(y.max()) - lo, self.min_span)
+        xs = self._x[self.points - len(y):]
+        ys = (self.height - PAD) - (y - lo) / span * (self.height - 2 * PAD)
+        return np.column_stack((xs, ys)).ravel().tolist(), int(y.argmin()), int(y.argmax())
+
+    def update(self, series):
+        y = series[0]
+        if len(y) < 2:
+            return
+        flat, i_min, i_max = self.coords(y)
+        canvas = self.canvas
+        canvas.coords(self.line, flat)
+        if self.fill is not None:
+            canvas.coords(self.fill, [flat[0], self.height] + flat + [flat[-2], self.height])
+        for marker, i in zip(self.markers, (i_min, i_max)):
+            x, y = flat[2 * i], flat[2 * i + 1]
+            canvas.coords(marker, x - MARKER_R, y - MARKER_R, x + MARKER_R, y + MARKER_R)
+        # Los elementos se crean ocultos hasta tener coordenadas válidas
+        while self._hidden:
+            canvas.itemconfigure(self._hidden.pop(), state="normal")
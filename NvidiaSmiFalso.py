@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import argparse
+import math
+import sys
+import time
+
+# Sustituto de nvidia-smi para probar BackendGPU sin GPU. Acepta los mismos
+# argumentos que usa NvidiaSmiStream y emite el CSV de --query-gpu en bucle:
+#
+#   python -m Recolector collect --gpu-binary ./NvidiaSmiFalso.py
+#
+# --gpus, --hang-after y --exit-after permiten simular varias tarjetas, un
+# proceso colgado y un proceso que muere.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="nvidia-smi falso")
+    parser.add_argument("--query-gpu", default="")
+    parser.add_argument("--format", default="")
+    parser.add_argument("-lms", "--loop-ms", dest="loop_ms", type=int, default=None)
+    parser.add_argument("--gpus", type=int, default=1, help="número de GPUs simuladas")
+    parser.add_argument("--hang-after", type=int, default=None, help="deja de emitir tras N tandas")
+    parser.add_argument("--exit-after", type=int, default=None, help="termina tras N tandas")
+    args = parser.parse_args(argv)
+
+    tick = 0
+    while True:
+        for i in range(args.gpus):
+            load = 50 + 45 * math.sin(tick / 5 + i)
+            mem_used = 1024 + 512 * i + tick % 256
+            print(f"{i}, Fake GPU {i}, {load:.0f}, {mem_used}, 8192, {40 + i + tick % 10}")
+        sys.stdout.flush()
+        tick += 1
+
+        if args.loop_ms is None or (args.exit_after is not None and tick >= args.exit_after):
+            return 0
+        if args.hang_after is not None and tick >= args.hang_after:
+            while True:
+                time.sleep(3600)
+        time.sleep(args.loop_ms / 1000)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,154 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import psutil
-import platform
+import argparse
 import time
-
-# Intentar usar GPUtil (opcional)
-try:
-    import GPUtil
-    GPUtil_available = True
-except Exception:
-    GPUtil_available = False
-
-import matplotlib.style as style
-style.use('dark_background')  # Tema oscuro
-
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
+
+# Matplotlib (Graficas) y GPUtil se cargan en el primer uso para que la
+# pestaña compacta aparezca sin esperar a esas importaciones; las
+# mini-gráficas compactas (MiniGraficas) solo usan un tk.Canvas
+from Alertas import AlertEngine, open_alert_log
+from Exportador import MetricsExporter
+from Historial import MatrixSeries, memory_history, open_history
+from Instrumentacion import Instrumentation, format_summary, instrument_canvas, instrument_psutil
+from Recolector import AdaptiveInterval, DeadlineTicker, MetricCollector, MetricSampler
+
+# Puntos visibles en las mini-gráficas y en las gráficas grandes
+MINI_POINTS = 30
+# Rangos de las gráficas grandes (segundos); el nivel de agregado lo elige el historial
+CHART_RANGES = (("1m", 60), ("10m", 600), ("1h", 3600), ("24h", 86400))
+DEFAULT_RANGE = "10m"
+# Capacidad del historial crudo en disco: 24 h a 1 Hz (menos si se muestrea
+# más rápido; los niveles agregados siguen cubriendo 24 h)
+HISTORY_CAPACITY = 86400
+HISTORY_KEYS = ("cpu", "ram", "disk_read", "disk_write", "net_up", "net_down", "gpu",
+                "mem_stall", "mem_stall_full", "io_stall", "cpu_stall", "page_in", "page_out", "swap_in", "swap_out")
+# Claves del historial que salen del tiempo parado de PSI: (recurso, some/full)
+STALL_KEYS = {"mem_stall": ("memory", "some"), "mem_stall_full": ("memory", "full"),
+              "io_stall": ("io", "some"), "cpu_stall": ("cpu", "some")}
+# Columnas del mapa de calor por núcleo (1 por muestra); vive solo en memoria
+CORE_HEATMAP_POINTS = 120
+# Los equipos remotos (--agent) guardan su historial crudo solo en memoria y
+# más corto; los niveles agregados siguen cubriendo 24 h
+REMOTE_HISTORY_CAPACITY = 3600
+LOCAL_HOST = "Este equipo"
+# Sin muestras de un equipo en este tiempo (más que el intervalo de 10 s
+# con la ventana escondida) sus reglas se evalúan sin datos en cada poll
+IDLE_ALERT_S = 15.0
+# Color de la mini-gráfica de cada panel compacto
+MINI_CHART_COLORS = {"cpu": "lime", "ram": "cyan", "disk": "orange", "net": "yellow", "gpu": "magenta"}
+# Discos / interfaces más activos que se listan en los paneles expandidos
+TOP_DEVICES = 4
+# Filas de la tabla de procesos
+TOP_PROCESSES = 15
+# Gráficas de cada panel expandido (atributos) y memoria máxima que pueden
+# ocupar entre todas; las de las pestañas menos recientes se liberan
+EXPANDED_CHARTS = {
+    "cpu": ("cpu_big_chart", "cpu_heatmap"),
+    "ram": ("ram_big_chart", "ram_pressure_chart", "ram_paging_chart"),
+    "disk": ("disk_big_chart",),
+    "net": ("net_big_chart",),
+    "gpu": ("gpu_big_chart",),
+}
+CHART_BUDGET_MB = 16
+# Parpadeo de la pestaña del borde mientras hay alertas activas
+ALERT_FLASH_MS = 500
+# Refresco del overlay de depuración (F12)
+OVERLAY_MS = 1000
+# Tras el primer frame se crea la mini-gráfica del panel activo
+WARMUP_DELAY_MS = 1500
+
+
+class HostView:
+    # Lo que cada equipo monitorizado tiene por separado: muestreador,
+    # historial, mapa de calor por núcleo y alertas. El widget dibuja el
+    # equipo seleccionado; los demás siguen muestreando y evaluando alertas.
+    def __init__(self, name, sampler, history, alert_rules=None, stale_s=None):
+        self.name = name
+        self.sampler = sampler
+        self.history = history
+        self.core_history = MatrixSeries(sampler.collector.facts.cores_logical or 1, CORE_HEATMAP_POINTS)
+        self.history_lock = threading.Lock()
+        self.alerts = AlertEngine(alert_rules)
+        # Las reglas se evalúan desde el muestreador y, sin muestras, desde la interfaz
+        self.alerts_lock = threading.Lock()
+        self.last_snap = None
+        # Hora de la última muestra (la del equipo) y momento local en que llegó
+        self.last_time = None
+        self.last_arrival = time.monotonic()
+        # Con stale_s (equipos remotos) el equipo cuenta como desconectado si
+        # su última muestra es más vieja o si el socket está cerrado
+        self.stale_s = stale_s
+        sampler.listeners.append(self.record_snapshot)
+
+    @property
+    def connected(self):
+        if self.stale_s is None:
+            return True
+        return (getattr(self.sampler.collector, 'connected', True)
+                and time.monotonic() - self.last_arrival < self.stale_s)
+
+    def record_snapshot(self, snap):
+        # Se ejecuta en el hilo del muestreador; history_lock evita que la
+        # interfaz lea series a medio actualizar (longitudes distintas)
+        now = snap['time']
+        gpus = snap['gpus']
+        snap['gpu_load'] = gpus[0].load*100 if gpus else 0
+        snap['total_net'] = snap['up_mb_s'] + snap['down_mb_s']
+
+        values = {
+            'cpu': snap['cpu'],
+            'ram': snap['vm'].percent,
+            'disk_read': snap['read_mb_s'],
+            'disk_write': snap['write_mb_s'],
+            'net_up': snap['up_mb_s'],
+            'net_down': snap['down_mb_s'],
+            'gpu': snap['gpu_load'],
+            'page_in': snap['page_in_mb_s'],
+            'page_out': snap['page_out_mb_s'],
+            'swap_in': snap['swap_in_mb_s'],
+            'swap_out': snap['swap_out_mb_s'],
+        }
+        psi = snap['psi']
+        for key, (resource, kind) in STALL_KEYS.items():
+            values[key] = getattr(psi[resource], kind) if psi.get(resource) else None
+        cores = snap['cpu_per_core']
+        with self.history_lock:
+            for key, value in values.items():
+                # Sin PSI / vmstat (no Linux) la serie queda a 0
+                self.history[key].append(now, 0.0 if value is None else value)
+            # Un agente no dice cuántos núcleos tiene hasta su primera muestra
+            if self.core_history.rows != max(1, len(cores)):
+                self.core_history = MatrixSeries(max(1, len(cores)), CORE_HEATMAP_POINTS)
+            self.core_history.append(now, cores)
+
+        # Sin GPU en esta muestra la regla de ausencia lo tiene que ver como falta de datos
+        if not gpus:
+            values['gpu'] = None
+        with self.alerts_lock:
+            self.alerts.evaluate(now, values)
+            self.last_time = now
+            self.last_arrival = time.monotonic()
+
+    def check_idle(self):
+        # Llamado en cada poll: si el equipo dejó de mandar muestras (agente
+        # caído, colector que falla siempre) las reglas ven la falta de datos.
+        # La hora sigue la del equipo desde su última muestra.
+        with self.alerts_lock:
+            idle = time.monotonic() - self.last_arrival
+            if self.last_time is not None and idle >= IDLE_ALERT_S:
+                self.alerts.evaluate(self.last_time + idle, {})
+
+    def close(self):
+        self.sampler.stop()
+        for series in self.history.values():
+            series.close()
 
 
 class EdgeWidget:
-    def __init__(self, width=405, height=260, y=60, step=18, delay=10, hide_gap=8):
+    def __init__(self, width=405, height=260, y=60, step=18, delay=10, hide_gap=8,
+                 collector=None, history=None, metrics_port=None, debug=False, alert_rules=None,
+                 schedule=None, agents=()):
         self.width = width
         self.height = height
         self.y = y
@@ -46,25 +175,113 @@ class EdgeWidget:
         self.expanded = False
         self.current_panel = "cpu"
 
-        # prev counters para tasas
-        self.prev_net = psutil.net_io_counters()
-        self.prev_disk = psutil.disk_io_counters()
-        self.prev_time = time.time()
-        psutil.cpu_percent(None)
+        # Muestreo en segundo plano; la interfaz consulta la cola cada poll_ms.
+        # El intervalo de muestreo se adapta al estado de la ventana (en una
+        # reproducción lo marca la grabación).
+        self.poll_ms = 250
+        sampler = MetricSampler(collector=collector or MetricCollector(top_n=TOP_PROCESSES),
+                                schedule=schedule or AdaptiveInterval())
+
+        # Historial compartido por todos los paneles (compactos y expandidos).
+        # Se guarda en disco y lo escribe el hilo del muestreador, así que al
+        # reabrir el widget las gráficas ya arrancan con datos. Las reglas de
+        # alerta se evalúan en el mismo hilo con cada muestra.
+        history = history if history is not None else open_history(HISTORY_KEYS, HISTORY_CAPACITY)
+        self.hosts = {LOCAL_HOST: HostView(LOCAL_HOST, sampler, history, alert_rules)}
+
+        # Equipos remotos (Agente.py): mismas muestras recibidas por socket.
+        # Las reglas guardan estado, así que cada equipo usa las de por defecto.
+        if agents:
+            from Agente import RECV_TIMEOUT_S, remote_sampler
+            for address in agents:
+                self.hosts[address] = HostView(address, remote_sampler(address),
+                                               memory_history(HISTORY_KEYS, REMOTE_HISTORY_CAPACITY),
+                                               stale_s=RECV_TIMEOUT_S)
+        self.host = self.hosts[LOCAL_HOST]
+        self.alert_flash = False
+        self.alert_flash_after = None
+
+        # Tiempos del propio widget (tick, render, lag del bucle after, colectores).
+        # Con debug también cada llamada a psutil y cada canvas.draw/blit.
+        self.instr = Instrumentation()
+        self.debug = debug
+        sampler.collector.registry.timing = lambda name, ms: self.instr.record(f"colector.{name}", ms)
+        self.instr.collectors = sampler.collector.registry.summary
+        self.instr.gauges['ticks'] = lambda: self.sampler.ticker.ticks
+        self.instr.gauges['ticks_perdidos'] = lambda: self.sampler.ticker.missed
+        self.instr.gauges['errores_muestreo'] = lambda: self.sampler.errors
+        if debug:
+            instrument_psutil(self.instr)
+            instrument_canvas(self.instr)
+        # El poll de la interfaz también va a plazos fijos (perf_counter, el reloj de t0)
+        self.poll_ticker = DeadlineTicker()
+        self._poll_due = None
+
+        # Exportador OpenMetrics opcional (solo localhost) con las mismas muestras
+        self.exporter = None
+        if metrics_port is not None:
+            self.exporter = MetricsExporter(metrics_port, stats=self.instr.summary)
+            sampler.listeners.append(self.exporter.publish)
+            self.exporter.start()
 
         self.build_ui()
 
         # eventos
         self.root.bind("<Enter>", self.on_enter)
         self.root.bind("<Leave>", self.on_leave)
-        self.root.bind("<Escape>", lambda e: self.root.destroy())
+        self.root.bind("<Escape>", lambda e: self.close())
+        self.root.bind("<F12>", lambda e: self.toggle_overlay())
 
+        for host in self.hosts.values():
+            host.sampler.start()
         self.update_stats()
+        self.root.after(WARMUP_DELAY_MS, self.warm_up)
+        if debug:
+            self.toggle_overlay()
+
+    # Los paneles leen siempre del equipo seleccionado
+    sampler = property(lambda self: self.host.sampler)
+    history = property(lambda self: self.host.history)
+    core_history = property(lambda self: self.host.core_history)
+    history_lock = property(lambda self: self.host.history_lock)
+    alerts = property(lambda self: self.host.alerts)
+    last_snap = property(lambda self: self.host.last_snap)
+
+    def warm_up(self):
+        # Carga diferida: se crea la mini-gráfica del panel activo cuando la ventana ya está en pantalla
+        if not self.expanded and self.current_panel in MINI_CHART_COLORS:
+            self.mini_chart(self.current_panel)
+
+    def mini_chart(self, name):
+        chart = self.mini_charts.get(name)
+        if chart is None:
+            from MiniGraficas import Sparkline
+            chart = Sparkline(self.panels[name], MINI_CHART_COLORS[name], MINI_POINTS)
+            chart.widget.pack(anchor="w", pady=(5,0))
+            self.mini_charts[name] = chart
+        return chart
+
+    def close(self):
+        for host in self.hosts.values():
+            host.close()
+        if self.exporter is not None:
+            self.exporter.stop()
+        self.root.destroy()
 
     def build_ui(self):
         self.container = ttk.Frame(self.root, padding=10)
         self.container.pack(fill="both", expand=True)
 
+        # Pestaña del borde: la franja que queda a la vista con la ventana
+        # escondida; parpadea cuando hay alertas
+        self.edge_tab = ttk.Frame(self.root, width=self.hide_gap)
+        self.edge_tab.place(x=0, y=0, relheight=1.0)
+
+        # Overlay de depuración sobre la esquina inferior derecha (oculto hasta F12)
+        self.overlay = ttk.Label(self.root, text="", font=("Consolas", 8), justify="left",
+                                 bootstyle="inverse-dark")
+        self.overlay_visible = False
+
         self.create_compact_ui()
         self.create_panels()
 
@@ -102,6 +319,22 @@ class EdgeWidget:
         hint = ttk.Label(self.compact_frame, text="Pasa el mouse por la pestaña →", bootstyle=INFO)
         hint.pack(side="bottom", anchor="e")
 
+        # Selector de equipo (solo con agentes remotos); la variable la
+        # comparten el modo compacto y el expandido
+        self.host_var = ttk.StringVar(value=self.host.name)
+        # Botones de equipo del modo expandido y estado mostrado (update_hosts)
+        self.host_buttons = {}
+        self.host_status = None
+        self._hosts_shown = None
+        if len(self.hosts) > 1:
+            hosts = ttk.Combobox(self.top_frame, textvariable=self.host_var, values=list(self.hosts),
+                                 state="readonly", width=12)
+            hosts.bind("<<ComboboxSelected>>", lambda e: self.select_host(self.host_var.get()))
+            hosts.pack(side="left", padx=2)
+            # ⚠ cuando el equipo seleccionado no manda muestras
+            self.host_status = ttk.Label(self.top_frame, text="", bootstyle=DANGER)
+            self.host_status.pack(side="left")
+
     def create_expanded_ui(self):
         # Interfaz expandida
         self.expanded_frame = ttk.Frame(self.container)
@@ -121,7 +354,8 @@ class EdgeWidget:
         self.expanded_buttons = {}
         button_configs = [
             ("cpu", "CPU", PRIMARY), ("ram", "MEMORIA", INFO), ("disk", "DISCO", WARNING),
-            ("net", "RED", SUCCESS), ("gpu", "GPU", SECONDARY), ("sys", "SISTEMA", DANGER)
+            ("net", "RED", SUCCESS), ("gpu", "GPU", SECONDARY), ("sys", "SISTEMA", DANGER),
+            ("procs", "PROCESOS", LIGHT)
         ]
         
         for key, text, style in button_configs:
@@ -130,6 +364,24 @@ class EdgeWidget:
             btn.pack(fill="x", pady=2)
             self.expanded_buttons[key] = btn
 
+        if len(self.hosts) > 1:
+            hosts_frame = ttk.LabelFrame(left_panel, text="Equipo", padding=5)
+            hosts_frame.pack(fill="x", pady=(20, 0))
+            for name in self.hosts:
+                button = ttk.Radiobutton(hosts_frame, text=name, value=name, variable=self.host_var,
+                                         bootstyle="toolbutton", command=lambda: self.select_host(self.host_var.get()))
+                button.pack(fill="x", pady=1)
+                self.host_buttons[name] = button
+
+        # Rango temporal de las gráficas grandes
+        range_frame = ttk.LabelFrame(left_panel, text="Rango", padding=5)
+        range_frame.pack(fill="x", pady=(20, 0))
+        
+        self.range_var = ttk.StringVar(value=DEFAULT_RANGE)
+        for text, _ in CHART_RANGES:
+            ttk.Radiobutton(range_frame, text=text, value=text, variable=self.range_var,
+                            bootstyle="toolbutton", command=self.set_range).pack(side="left", padx=2)
+
         # Estadísticas rápidas en el panel izquierdo
         stats_frame = ttk.LabelFrame(left_panel, text="Resumen", padding=10)
         stats_frame.pack(fill="x", pady=(20, 0))
@@ -138,28 +390,59 @@ class EdgeWidget:
             'cpu': ttk.Label(stats_frame, text="CPU: -- %", font=("Consolas", 9)),
             'ram': ttk.Label(stats_frame, text="RAM: -- %", font=("Consolas", 9)),
             'disk': ttk.Label(stats_frame, text="Disco: -- %", font=("Consolas", 9)),
-            'net': ttk.Label(stats_frame, text="Red: -- MB/s", font=("Consolas", 9))
+            'net': ttk.Label(stats_frame, text="Red: -- MB/s", font=("Consolas", 9)),
+            'alerts': ttk.Label(stats_frame, text="", font=("Consolas", 9), bootstyle=DANGER, wraplength=170)
         }
         
         for label in self.quick_stats.values():
             label.pack(anchor="w", pady=1)
+        # Texto de alertas mostrado (update_alert_tab solo lo toca si cambia)
+        self._alerts_shown = ""
 
         # Panel derecho - gráfica grande y detalles
         self.right_panel = ttk.Frame(main_expanded)
         self.right_panel.pack(side="right", fill="both", expand=True)
 
-        # Crear paneles expandidos
+        # Los paneles expandidos se crean al abrir su pestaña (expanded_panel)
         self.expanded_panels = {}
-        self.create_expanded_panels()
-
-    def create_expanded_panels(self):
-        # Panel CPU expandido
-        self.create_expanded_cpu_panel()
-        self.create_expanded_ram_panel()
-        self.create_expanded_disk_panel()
-        self.create_expanded_net_panel()
-        self.create_expanded_gpu_panel()
-        self.create_expanded_sys_panel()
+        self.big_charts = {}
+        # Pestañas con gráficas creadas, de la menos a la más reciente
+        self.chart_lru = []
+
+    def expanded_panel(self, name):
+        # Crea el panel la primera vez que se abre y vuelve a crear sus
+        # gráficas si se liberaron; se dibujan desde el historial guardado
+        f = self.expanded_panels.get(name)
+        if f is None:
+            getattr(self, f"create_expanded_{name}_panel")()
+            f = self.expanded_panels[name]
+        if name in EXPANDED_CHARTS:
+            if not hasattr(self, EXPANDED_CHARTS[name][0]):
+                getattr(self, f"create_expanded_{name}_charts")(f)
+            self.keep_charts(name)
+        return f
+
+    def keep_charts(self, name):
+        # Marca las gráficas de name como recién vistas y libera las de las
+        # pestañas menos recientes mientras se pase del presupuesto
+        if name in self.chart_lru:
+            self.chart_lru.remove(name)
+        self.chart_lru.append(name)
+        while len(self.chart_lru) > 1 and self.charts_memory() > CHART_BUDGET_MB * 1024 * 1024:
+            self.release_charts(self.chart_lru.pop(0))
+
+    def charts_memory(self):
+        return sum(getattr(self, attr).memory_bytes() for name in self.chart_lru for attr in EXPANDED_CHARTS[name])
+
+    def release_charts(self, name):
+        # Las etiquetas del panel se conservan; solo se destruyen las figuras
+        released = []
+        for attr in EXPANDED_CHARTS[name]:
+            released.append(getattr(self, attr))
+            released[-1].widget.destroy()
+            delattr(self, attr)
+        # big_charts (las que siguen el rango) puede tener varias por panel
+        self.big_charts = {key: chart for key, chart in self.big_charts.items() if chart not in released}
 
     def create_expanded_cpu_panel(self):
         f = ttk.Frame(self.right_panel)
@@ -208,24 +491,22 @@ class EdgeWidget:
         for label in self.cpu_detailed_right.values():
             label.pack(anchor="w", pady=2)
 
-        # Gráfica grande
-        self.cpu_big_fig = Figure(figsize=(8, 4), dpi=100, facecolor='#2b2b2b')
-        self.cpu_big_fig.patch.set_facecolor('#2b2b2b')
-        self.cpu_big_ax = self.cpu_big_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.cpu_big_ax.set_title("Uso del CPU en Tiempo Real", color='white', fontsize=12)
-        self.cpu_big_ax.set_ylabel("Uso (%)", color='white')
-        self.cpu_big_ax.set_ylim(0, 100)
-        self.cpu_big_ax.grid(True, alpha=0.3, color='white')
-        self.cpu_big_ax.tick_params(colors='white')
-        
-        self.cpu_big_canvas = FigureCanvasTkAgg(self.cpu_big_fig, master=f)
-        self.cpu_big_canvas.get_tk_widget().pack(fill="both", expand=True, pady=10)
-        
-        # Datos extendidos para gráfica grande
-        self.cpu_big_data = []
-        
+        self.create_expanded_cpu_charts(f)
         self.expanded_panels["cpu"] = f
 
+    def create_expanded_cpu_charts(self, f):
+        # Mapa de calor por núcleo (se empaqueta antes para reservar su alto)
+        from Graficas import HeatmapChart, TimeChart
+        self.cpu_heatmap = HeatmapChart(f, self.core_history.rows, CORE_HEATMAP_POINTS, figsize=(8, 1.6), dpi=100,
+                                        title="Uso por núcleo", ylabel="Núcleo")
+        self.cpu_heatmap.widget.pack(side="bottom", fill="x", pady=(0, 10))
+
+        # Gráfica grande
+        self.cpu_big_chart = TimeChart(f, [("lime", None)], self.range_seconds(), figsize=(8, 4), dpi=100,
+                                       title="Uso del CPU en Tiempo Real", ylabel="Uso (%)", ylim=(0, 100))
+        self.cpu_big_chart.widget.pack(fill="both", expand=True, pady=10)
+        self.big_charts["cpu"] = self.cpu_big_chart
+
     def create_expanded_ram_panel(self):
         f = ttk.Frame(self.right_panel)
         
@@ -268,22 +549,33 @@ class EdgeWidget:
         for label in self.ram_detailed_right.values():
             label.pack(anchor="w", pady=2)
 
-        # Gráfica grande RAM
-        self.ram_big_fig = Figure(figsize=(8, 4), dpi=100, facecolor='#2b2b2b')
-        self.ram_big_fig.patch.set_facecolor('#2b2b2b')
-        self.ram_big_ax = self.ram_big_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.ram_big_ax.set_title("Uso de Memoria en Tiempo Real", color='white', fontsize=12)
-        self.ram_big_ax.set_ylabel("Uso (%)", color='white')
-        self.ram_big_ax.set_ylim(0, 100)
-        self.ram_big_ax.grid(True, alpha=0.3, color='white')
-        self.ram_big_ax.tick_params(colors='white')
-        
-        self.ram_big_canvas = FigureCanvasTkAgg(self.ram_big_fig, master=f)
-        self.ram_big_canvas.get_tk_widget().pack(fill="both", expand=True, pady=10)
-        
-        self.ram_big_data = []
+        # Presión: tiempo parado (PSI) y paginación
+        self.ram_pressure = ttk.Label(f, text="", font=("Consolas", 9), justify="left")
+        self.ram_pressure.pack(fill="x")
+
+        self.create_expanded_ram_charts(f)
         self.expanded_panels["ram"] = f
 
+    def create_expanded_ram_charts(self, f):
+        # Presión y paginación abajo (se empaquetan antes para reservar su alto)
+        from Graficas import TimeChart
+        self.ram_paging_chart = TimeChart(f, [("green", "Entrada"), ("red", "Salida"), ("violet", "Swap entrada"),
+                                              ("yellow", "Swap salida")], self.range_seconds(), figsize=(8, 1.8),
+                                          dpi=100, title="Paginación", ylabel="MB/s", legend=True, min_span=1)
+        self.ram_paging_chart.widget.pack(side="bottom", fill="x", pady=(0, 10))
+        self.ram_pressure_chart = TimeChart(f, [("cyan", "Memoria"), ("red", "Memoria (full)"), ("orange", "Disco"),
+                                                ("lime", "CPU")], self.range_seconds(), figsize=(8, 1.8), dpi=100,
+                                            title="Tiempo parado (PSI)", ylabel="%", legend=True, min_span=5)
+        self.ram_pressure_chart.widget.pack(side="bottom", fill="x", pady=(0, 10))
+
+        # Gráfica grande RAM
+        self.ram_big_chart = TimeChart(f, [("cyan", None)], self.range_seconds(), figsize=(8, 4), dpi=100,
+                                       title="Uso de Memoria en Tiempo Real", ylabel="Uso (%)", ylim=(0, 100))
+        self.ram_big_chart.widget.pack(fill="both", expand=True, pady=10)
+        self.big_charts["ram"] = self.ram_big_chart
+        self.big_charts["ram_pressure"] = self.ram_pressure_chart
+        self.big_charts["ram_paging"] = self.ram_paging_chart
+
     def create_expanded_disk_panel(self):
         f = ttk.Frame(self.right_panel)
         
@@ -326,22 +618,21 @@ class EdgeWidget:
         for label in self.disk_detailed_right.values():
             label.pack(anchor="w", pady=2)
 
-        # Gráfica grande del disco
-        self.disk_big_fig = Figure(figsize=(8, 4), dpi=100, facecolor='#2b2b2b')
-        self.disk_big_fig.patch.set_facecolor('#2b2b2b')
-        self.disk_big_ax = self.disk_big_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.disk_big_ax.set_title("Actividad del Disco en Tiempo Real", color='white', fontsize=12)
-        self.disk_big_ax.set_ylabel("MB/s", color='white')
-        self.disk_big_ax.grid(True, alpha=0.3, color='white')
-        self.disk_big_ax.tick_params(colors='white')
-        
-        self.disk_big_canvas = FigureCanvasTkAgg(self.disk_big_fig, master=f)
-        self.disk_big_canvas.get_tk_widget().pack(fill="both", expand=True, pady=10)
-        
-        self.disk_big_read_data = []
-        self.disk_big_write_data = []
+        # Desglose por disco
+        self.disk_devices = ttk.Label(f, text="", font=("Consolas", 9), justify="left")
+        self.disk_devices.pack(fill="x")
+
+        self.create_expanded_disk_charts(f)
         self.expanded_panels["disk"] = f
 
+    def create_expanded_disk_charts(self, f):
+        # Gráfica grande del disco
+        from Graficas import TimeChart
+        self.disk_big_chart = TimeChart(f, [("green", "Lectura"), ("red", "Escritura")], self.range_seconds(),
+                                        figsize=(8, 4), dpi=100, title="Actividad del Disco en Tiempo Real", ylabel="MB/s", legend=True)
+        self.disk_big_chart.widget.pack(fill="both", expand=True, pady=10)
+        self.big_charts["disk"] = self.disk_big_chart
+
     def create_expanded_net_panel(self):
         f = ttk.Frame(self.right_panel)
         
@@ -372,22 +663,23 @@ class EdgeWidget:
         for label in self.net_detailed.values():
             label.pack(anchor="w", pady=2)
 
-        # Gráfica grande de red
-        self.net_big_fig = Figure(figsize=(8, 4), dpi=100, facecolor='#2b2b2b')
-        self.net_big_fig.patch.set_facecolor('#2b2b2b')
-        self.net_big_ax = self.net_big_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.net_big_ax.set_title("Actividad de Red en Tiempo Real", color='white', fontsize=12)
-        self.net_big_ax.set_ylabel("MB/s", color='white')
-        self.net_big_ax.grid(True, alpha=0.3, color='white')
-        self.net_big_ax.tick_params(colors='white')
-        
-        self.net_big_canvas = FigureCanvasTkAgg(self.net_big_fig, master=f)
-        self.net_big_canvas.get_tk_widget().pack(fill="both", expand=True, pady=10)
-        
-        self.net_big_upload_data = []
-        self.net_big_download_data = []
+        # Desglose por interfaz
+        right_info = ttk.Frame(info_frame)
+        right_info.pack(side="right", fill="both", expand=True)
+        self.net_devices = ttk.Label(right_info, text="", font=("Consolas", 9), justify="left")
+        self.net_devices.pack(anchor="w", pady=2)
+
+        self.create_expanded_net_charts(f)
         self.expanded_panels["net"] = f
 
+    def create_expanded_net_charts(self, f):
+        # Gráfica grande de red
+        from Graficas import TimeChart
+        self.net_big_chart = TimeChart(f, [("red", "↑ Subida"), ("green", "↓ Bajada")], self.range_seconds(),
+                                       figsize=(8, 4), dpi=100, title="Actividad de Red en Tiempo Real", ylabel="MB/s", legend=True)
+        self.net_big_chart.widget.pack(fill="both", expand=True, pady=10)
+        self.big_charts["net"] = self.net_big_chart
+
     def create_expanded_gpu_panel(self):
         f = ttk.Frame(self.right_panel)
         
@@ -415,22 +707,17 @@ class EdgeWidget:
         for label in self.gpu_detailed.values():
             label.pack(anchor="w", pady=2)
 
-        # Gráfica GPU
-        self.gpu_big_fig = Figure(figsize=(8, 4), dpi=100, facecolor='#2b2b2b')
-        self.gpu_big_fig.patch.set_facecolor('#2b2b2b')
-        self.gpu_big_ax = self.gpu_big_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.gpu_big_ax.set_title("Uso de GPU en Tiempo Real", color='white', fontsize=12)
-        self.gpu_big_ax.set_ylabel("Uso (%)", color='white')
-        self.gpu_big_ax.set_ylim(0, 100)
-        self.gpu_big_ax.grid(True, alpha=0.3, color='white')
-        self.gpu_big_ax.tick_params(colors='white')
-        
-        self.gpu_big_canvas = FigureCanvasTkAgg(self.gpu_big_fig, master=f)
-        self.gpu_big_canvas.get_tk_widget().pack(fill="both", expand=True, pady=10)
-        
-        self.gpu_big_data = []
+        self.create_expanded_gpu_charts(f)
         self.expanded_panels["gpu"] = f
 
+    def create_expanded_gpu_charts(self, f):
+        # Gráfica GPU
+        from Graficas import TimeChart
+        self.gpu_big_chart = TimeChart(f, [("magenta", None)], self.range_seconds(), figsize=(8, 4), dpi=100,
+                                       title="Uso de GPU en Tiempo Real", ylabel="Uso (%)", ylim=(0, 100))
+        self.gpu_big_chart.widget.pack(fill="both", expand=True, pady=10)
+        self.big_charts["gpu"] = self.gpu_big_chart
+
     def create_expanded_sys_panel(self):
         f = ttk.Frame(self.right_panel)
         
@@ -462,9 +749,47 @@ class EdgeWidget:
 
         self.expanded_panels["sys"] = f
 
+    def create_expanded_procs_panel(self):
+        f = ttk.Frame(self.right_panel)
+        
+        header = ttk.Frame(f)
+        header.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(header, text="PROCESOS", font=("Consolas", 14, "bold")).pack(side="left")
+        
+        controls = ttk.Frame(header)
+        controls.pack(side="right")
+        ttk.Button(controls, text="📌", bootstyle=SECONDARY, command=self.toggle_pin).pack(side="right", padx=2)
+        ttk.Button(controls, text="⤡", bootstyle=INFO, command=lambda: self.toggle_expand("procs")).pack(side="right", padx=2)
+
+        # Criterio de ordenación del top-N
+        sort_frame = ttk.Frame(f)
+        sort_frame.pack(fill="x", pady=(0, 10))
+        ttk.Label(sort_frame, text="Ordenar por:", font=("Consolas", 10)).pack(side="left", padx=(0, 5))
+        
+        self.procs_sort = ttk.StringVar(value="cpu")
+        for key, text in (("cpu", "CPU"), ("rss", "Memoria"), ("io", "I/O")):
+            ttk.Radiobutton(sort_frame, text=text, value=key, variable=self.procs_sort,
+                            bootstyle="toolbutton", command=self.refresh_visible).pack(side="left", padx=2)
+
+        # Tabla con filas fijas que se actualizan en su sitio
+        columns = ("pid", "name", "cpu", "rss", "io")
+        self.procs_table = ttk.Treeview(f, columns=columns, show="headings", height=TOP_PROCESSES)
+        for col, text, width, anchor in (("pid", "PID", 70, "e"), ("name", "Nombre", 220, "w"),
+                                         ("cpu", "CPU %", 80, "e"), ("rss", "RAM MB", 90, "e"),
+                                         ("io", "I/O MB/s", 90, "e")):
+            self.procs_table.heading(col, text=text)
+            self.procs_table.column(col, width=width, anchor=anchor)
+        for i in range(TOP_PROCESSES):
+            self.procs_table.insert("", "end", iid=str(i), values=("", "", "", "", ""))
+        self.procs_table.pack(fill="both", expand=True, pady=10)
+
+        self.expanded_panels["procs"] = f
+
     # Crear paneles compactos (originales)
     def create_panels(self):
         self.panels = {}
+        self.mini_charts = {}
         self.create_cpu_panel()
         self.create_ram_panel()
         self.create_disk_panel()
@@ -485,16 +810,6 @@ class EdgeWidget:
         self.cpu_cores.pack(anchor="w")
         self.panels["cpu"] = f
 
-        # Mini gráfica CPU
-        self.cpu_fig = Figure(figsize=(4,0.7), dpi=70, facecolor='#2b2b2b')
-        self.cpu_fig.patch.set_facecolor('#2b2b2b')
-        self.cpu_ax = self.cpu_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.cpu_ax.set_xticks([])
-        self.cpu_ax.set_yticks([])
-        self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, master=f)
-        self.cpu_canvas.get_tk_widget().pack(anchor="w", pady=(5,0))
-        self.cpu_data = []
-
         # Botones
         self.pin_btn = ttk.Button(f, text="📌", bootstyle=SECONDARY, command=self.toggle_pin)
         self.pin_btn.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=20)
@@ -510,18 +825,10 @@ class EdgeWidget:
         self.ram_usage.pack(anchor="w")
         self.ram_detail = ttk.Label(f, text="Usada: -- / -- GB")
         self.ram_detail.pack(anchor="w")
+        self.ram_pressure_compact = ttk.Label(f, text="PSI: -- %  Swap: -- MB/s")
+        self.ram_pressure_compact.pack(anchor="w")
         self.panels["ram"] = f
 
-        # Mini-gráfica RAM
-        self.ram_fig = Figure(figsize=(4,0.7), dpi=70, facecolor='#2b2b2b')
-        self.ram_fig.patch.set_facecolor('#2b2b2b')
-        self.ram_ax = self.ram_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.ram_ax.set_xticks([])
-        self.ram_ax.set_yticks([])
-        self.ram_canvas = FigureCanvasTkAgg(self.ram_fig, master=f)
-        self.ram_canvas.get_tk_widget().pack(anchor="w", pady=(5,0))
-        self.ram_data = []
-
         # Botones
         ttk.Button(f, text="📌", bootstyle=SECONDARY, command=self.toggle_pin).place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=20)
         ttk.Button(f, text="⤢", bootstyle=INFO, command=lambda: self.toggle_expand("ram")).place(relx=1.0, rely=0.0, anchor="ne", x=-50, y=20)
@@ -538,16 +845,6 @@ class EdgeWidget:
         self.disk_free.pack(anchor="w")
         self.panels["disk"] = f
 
-        # Mini-gráfica Disco
-        self.disk_fig = Figure(figsize=(4,0.7), dpi=70, facecolor='#2b2b2b')
-        self.disk_fig.patch.set_facecolor('#2b2b2b')
-        self.disk_ax = self.disk_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.disk_ax.set_xticks([])
-        self.disk_ax.set_yticks([])
-        self.disk_canvas = FigureCanvasTkAgg(self.disk_fig, master=f)
-        self.disk_canvas.get_tk_widget().pack(anchor="w", pady=(5,0))
-        self.disk_data = []
-
         # Botones
         ttk.Button(f, text="📌", bootstyle=SECONDARY, command=self.toggle_pin).place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=20)
         ttk.Button(f, text="⤢", bootstyle=INFO, command=lambda: self.toggle_expand("disk")).place(relx=1.0, rely=0.0, anchor="ne", x=-50, y=20)
@@ -562,16 +859,6 @@ class EdgeWidget:
         self.net_total.pack(anchor="w")
         self.panels["net"] = f
 
-        # Mini-gráfica Red
-        self.net_fig = Figure(figsize=(4,0.7), dpi=70, facecolor='#2b2b2b')
-        self.net_fig.patch.set_facecolor('#2b2b2b')
-        self.net_ax = self.net_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.net_ax.set_xticks([])
-        self.net_ax.set_yticks([])
-        self.net_canvas = FigureCanvasTkAgg(self.net_fig, master=f)
-        self.net_canvas.get_tk_widget().pack(anchor="w", pady=(5,0))
-        self.net_data = []
-
         # Botones
         ttk.Button(f, text="📌", bootstyle=SECONDARY, command=self.toggle_pin).place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=20)
         ttk.Button(f, text="⤢", bootstyle=INFO, command=lambda: self.toggle_expand("net")).place(relx=1.0, rely=0.0, anchor="ne", x=-50, y=20)
@@ -584,16 +871,6 @@ class EdgeWidget:
         self.gpu_info.pack(anchor="w")
         self.panels["gpu"] = f
 
-        # Mini-gráfica GPU
-        self.gpu_fig = Figure(figsize=(4,0.7), dpi=70, facecolor='#2b2b2b')
-        self.gpu_fig.patch.set_facecolor('#2b2b2b')
-        self.gpu_ax = self.gpu_fig.add_subplot(111, facecolor='#2b2b2b')
-        self.gpu_ax.set_xticks([])
-        self.gpu_ax.set_yticks([])
-        self.gpu_canvas = FigureCanvasTkAgg(self.gpu_fig, master=f)
-        self.gpu_canvas.get_tk_widget().pack(anchor="w", pady=(5,0))
-        self.gpu_data = []
-
         # Botones
         ttk.Button(f, text="📌", bootstyle=SECONDARY, command=self.toggle_pin).place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=20)
         ttk.Button(f, text="⤢", bootstyle=INFO, command=lambda: self.toggle_expand("gpu")).place(relx=1.0, rely=0.0, anchor="ne", x=-50, y=20)
@@ -620,18 +897,20 @@ class EdgeWidget:
             for p in self.panels.values():
                 p.pack_forget()
             self.panels[name].pack(fill="both", expand=True)
+            self.refresh_visible()
 
     def show_expanded_panel(self, name):
         self.current_panel = name
         if self.expanded:
             for p in self.expanded_panels.values():
                 p.pack_forget()
-            self.expanded_panels[name].pack(fill="both", expand=True)
+            self.expanded_panel(name).pack(fill="both", expand=True)
             
             # Resaltar botón activo
             for btn in self.expanded_buttons.values():
                 btn.configure(bootstyle=OUTLINE)
             self.expanded_buttons[name].configure(bootstyle=PRIMARY)
+            self.refresh_visible()
 
     def toggle_expand(self, name):
         self.expanded = not self.expanded
@@ -653,7 +932,10 @@ class EdgeWidget:
             self.show_expanded_panel(name)
             
         else:
-            # Volver a modo compacto
+            # Volver a modo compacto (la tabla de procesos solo existe en el expandido)
+            if name not in self.panels:
+                name = "cpu"
+                self.current_panel = name
             self.root.geometry(f"{self.width}x{self.height}+{self.screen_w - self.width}+{self.y}")
             self.open_x = self.screen_w - self.width
             
@@ -662,327 +944,362 @@ class EdgeWidget:
             self.compact_frame.pack(fill="both", expand=True)
             self.show_panel(name)
 
+    def select_host(self, name):
+        # Cambia el equipo que se dibuja; el anterior sigue muestreando
+        if name == self.host.name:
+            return
+        self.sampler.collector.processes_enabled = False
+        self.sampler.set_state('hidden')
+        self.host = self.hosts[name]
+        self.host_var.set(name)
+        self.refresh_visible()
+
+    def range_seconds(self):
+        return dict(CHART_RANGES)[self.range_var.get()]
+
+    def set_range(self):
+        for chart in self.big_charts.values():
+            chart.set_span(self.range_seconds())
+        self.refresh_visible()
+
+    def history_window(self, *keys):
+        # Datos de las gráficas grandes para el rango elegido, con X en
+        # segundos respecto a la última muestra
+        seconds = self.range_seconds()
+        now = self.history[keys[0]].times(1)
+        now = now[0] if len(now) else 0.0
+        series = []
+        envelopes = []
+        for key in keys:
+            times, avg, lo, hi = self.history[key].window(seconds, now)
+            series.append(avg)
+            envelopes.append(None if lo is None else (lo, hi))
+        return series, times - now, envelopes
+
     def toggle_pin(self):
         self.pinned = not self.pinned
         if hasattr(self, 'pin_btn'):
             self.pin_btn.configure(bootstyle=SUCCESS if self.pinned else SECONDARY)
 
     def update_stats(self):
-        now = time.time()
-        dt = max(0.001, now - self.prev_time)
+        # Solo se usa la muestra más reciente; si no hay nada nuevo no se redibuja
+        # La tabla de procesos solo se muestrea mientras se está viendo
+        t0 = time.perf_counter()
+        if self._poll_due is not None:
+            # Retraso del bucle after respecto a lo programado
+            self.instr.record("after_lag", max(0.0, (t0 - self._poll_due) * 1000))
+        self.sampler.collector.processes_enabled = (
+            self.expanded and self.current_panel == "procs" and self.is_visible())
+        self.sampler.set_state(self.sampling_state())
+
+        snap = self.sampler.latest()
+        if snap is not None:
+            # El historial ya lo alimenta el muestreador aunque no se vea nada
+            self.host.last_snap = snap
+            if self.is_visible():
+                self.render(snap)
+
+        self.update_alert_tab()
+        self.update_hosts()
+
+        self.instr.record("tick", (time.perf_counter() - t0) * 1000)
+        delay = self.poll_ticker.wait_time(self.poll_ms / 1000)
+        self._poll_due = self.poll_ticker.deadline
+        self.root.after(int(delay * 1000), self.update_stats)
+
+    def update_alert_tab(self):
+        # Empieza o para el parpadeo según haya alertas activas en cualquier
+        # equipo (se comprueba en cada poll)
+        for host in self.hosts.values():
+            host.check_idle()
+        firing = [(host.name, alert) for host in self.hosts.values() for alert in host.alerts.firing]
+        if firing and self.alert_flash_after is None:
+            self._flash_alert_tab()
+        elif not firing and self.alert_flash_after is not None:
+            self.root.after_cancel(self.alert_flash_after)
+            self.alert_flash_after = None
+            self.alert_flash = False
+            self.edge_tab.configure(bootstyle=DEFAULT)
+        if self.expanded and hasattr(self, 'quick_stats'):
+            several = len(self.hosts) > 1
+            text = "\n".join(f"⚠ {name}: {a.rule}" if several else f"⚠ {a.rule}" for name, a in firing)
+            if text != self._alerts_shown:
+                self.quick_stats['alerts'].config(text=text)
+                self._alerts_shown = text
+
+    def update_hosts(self):
+        # Marca los equipos desconectados; los datos que se ven de uno de
+        # ellos son los de su última muestra. Solo se toca Tk si algo cambia.
+        if self.host_status is None:
+            return
+        disconnected = frozenset(name for name, host in self.hosts.items() if not host.connected)
+        shown = (disconnected, self.host.name)
+        if shown == self._hosts_shown:
+            return
+        self._hosts_shown = shown
+        for name, button in self.host_buttons.items():
+            button.configure(text=f"{name} (sin conexión)" if name in disconnected else name)
+        self.host_status.configure(text="⚠ sin conexión" if self.host.name in disconnected else "")
+
+    def _flash_alert_tab(self):
+        self.alert_flash = not self.alert_flash
+        self.edge_tab.configure(bootstyle=DANGER if self.alert_flash else DEFAULT)
+        self.alert_flash_after = self.root.after(ALERT_FLASH_MS, self._flash_alert_tab)
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+            self.overlay.lift()
+            self.update_overlay()
+        else:
+            self.overlay.place_forget()
 
-        # CPU
-        cpu = psutil.cpu_percent(interval=None)
-        freq = psutil.cpu_freq()
-        freq_text = f"{freq.current:.0f} MHz" if freq and freq.current else "N/D"
-        
-        # Actualizar interfaz compacta
-        if hasattr(self, 'cpu_usage'):
+    def update_overlay(self):
+        if not self.overlay_visible:
+            return
+        self.overlay.config(text=format_summary(self.instr.summary()))
+        self.root.after(OVERLAY_MS, self.update_overlay)
+
+    def stats(self):
+        # Superficie consultable de la instrumentación (también en /stats del exportador)
+        return self.instr.summary()
+
+    def is_visible(self):
+        # Con la ventana escondida en el borde no se dibuja nada
+        return self.is_open or self.animating
+
+    def sampling_state(self):
+        if not self.is_visible():
+            return 'hidden'
+        return 'expanded' if self.expanded else 'compact'
+
+    def refresh_visible(self):
+        # Redibuja al momento el panel que acaba de quedar visible
+        if self.last_snap is not None and self.is_visible():
+            self.render(self.last_snap)
+
+    def render(self, snap):
+        # Solo se actualiza el panel activo (compacto o expandido)
+        renderer = getattr(self, f"render_{self.current_panel}", None)
+        if renderer:
+            t0 = time.perf_counter()
+            self.instr.chart_ms = 0.0
+            with self.history_lock:
+                renderer(snap)
+            elapsed = (time.perf_counter() - t0) * 1000
+            self.instr.record(f"render.{self.current_panel}", elapsed)
+            if self.debug:
+                # chart_ms lleva lo que costaron draw/blit; el resto son etiquetas
+                self.instr.record("etiquetas", elapsed - self.instr.chart_ms)
+
+        # Actualizar estadísticas rápidas (solo en modo expandido)
+        if self.expanded and hasattr(self, 'quick_stats'):
+            self.quick_stats['cpu'].config(text=f"CPU: {snap['cpu']:.0f} %")
+            self.quick_stats['ram'].config(text=f"RAM: {snap['vm'].percent:.0f} %")
+            self.quick_stats['disk'].config(text=f"Disco: {snap['du'].percent:.0f} %")
+            self.quick_stats['net'].config(text=f"Red: {snap['total_net']:.1f} MB/s")
+
+    def render_cpu(self, snap):
+        now = snap['time']
+        cpu = snap['cpu']
+        freq = snap['freq']
+        freq_text = f"{freq:.0f} MHz" if freq else "N/D"
+
+        if not self.expanded:
             self.cpu_usage.config(text=f"{cpu:.0f} %")
             self.cpu_freq.config(text=f"Freq: {freq_text}")
-            self.cpu_cores.config(text=f"Cores: {psutil.cpu_count(logical=False)} (L: {psutil.cpu_count(logical=True)})")
+            self.cpu_cores.config(text=f"Cores: {snap['cores_physical']} (L: {snap['cores_logical']})")
+            self.mini_chart('cpu').update([self.history['cpu'].values(MINI_POINTS)])
+            return
+
+        if hasattr(self, 'cpu_big_chart'):
+            self.cpu_big_chart.update(*self.history_window('cpu'))
+            if self.cpu_heatmap.rows != self.core_history.rows:
+                self.cpu_heatmap.set_rows(self.core_history.rows)
+            self.cpu_heatmap.update(self.core_history.values(CORE_HEATMAP_POINTS))
 
-        # Actualizar mini-gráfica CPU
-        self.cpu_data.append(cpu)
-        if len(self.cpu_data) > 30:
-            self.cpu_data.pop(0)
-        
-        if hasattr(self, 'cpu_ax'):
-            self.cpu_ax.clear()
-            self.cpu_ax.set_facecolor('#2b2b2b')
-            self.cpu_ax.plot(self.cpu_data, color="lime", linewidth=2)
-            self.cpu_ax.set_xticks([])
-            self.cpu_ax.set_yticks([])
-            self.cpu_canvas.draw()
-
-        # Actualizar gráfica expandida CPU
-        if self.expanded and hasattr(self, 'cpu_big_ax'):
-            self.cpu_big_data.append(cpu)
-            if len(self.cpu_big_data) > 100:
-                self.cpu_big_data.pop(0)
-            
-            self.cpu_big_ax.clear()
-            self.cpu_big_ax.set_facecolor('#2b2b2b')
-            self.cpu_big_ax.plot(self.cpu_big_data, color="lime", linewidth=2)
-            self.cpu_big_ax.set_title("Uso del CPU en Tiempo Real", color='white', fontsize=12)
-            self.cpu_big_ax.set_ylabel("Uso (%)", color='white')
-            self.cpu_big_ax.set_ylim(0, 100)
-            self.cpu_big_ax.grid(True, alpha=0.3, color='white')
-            self.cpu_big_ax.tick_params(colors='white')
-            self.cpu_big_canvas.draw()
-            
             # Actualizar información detallada
-            if hasattr(self, 'cpu_detailed'):
-                self.cpu_detailed['usage'].config(text=f"Uso: {cpu:.1f} %")
-                self.cpu_detailed['freq'].config(text=f"Frecuencia: {freq_text}")
-                self.cpu_detailed['cores'].config(text=f"Núcleos: {psutil.cpu_count(logical=False)} físicos ({psutil.cpu_count(logical=True)} lógicos)")
-                
-                try:
-                    processes = len(psutil.pids())
-                    self.cpu_detailed_right['processes'].config(text=f"Procesos: {processes}")
-                    
-                    boot_time = psutil.boot_time()
-                    uptime_seconds = int(now - boot_time)
-                    uptime_text = f"{uptime_seconds//3600}h {(uptime_seconds%3600)//60}m"
-                    self.cpu_detailed_right['uptime'].config(text=f"Tiempo activo: {uptime_text}")
-                except:
-                    pass
-
-        # RAM
-        vm = psutil.virtual_memory()
+            self.cpu_detailed['usage'].config(text=f"Uso: {cpu:.1f} %")
+            self.cpu_detailed['freq'].config(text=f"Frecuencia: {freq_text}")
+            self.cpu_detailed['cores'].config(text=f"Núcleos: {snap['cores_physical']} físicos ({snap['cores_logical']} lógicos)")
+
+            if snap['processes'] is not None:
+                self.cpu_detailed_right['processes'].config(text=f"Procesos: {snap['processes']}")
+
+            uptime_seconds = int(now - snap['boot_time'])
+            uptime_text = f"{uptime_seconds//3600}h {(uptime_seconds%3600)//60}m"
+            self.cpu_detailed_right['uptime'].config(text=f"Tiempo activo: {uptime_text}")
+
+    def render_ram(self, snap):
+        vm = snap['vm']
+        swap = snap['swap']
         used_gb = vm.used / (1024**3)
         total_gb = vm.total / (1024**3)
-        
-        if hasattr(self, 'ram_usage'):
+        memory_stall = snap['psi'].get('memory')
+        swap_mb_s = snap['swap_in_mb_s'] + snap['swap_out_mb_s']
+
+        if not self.expanded:
             self.ram_usage.config(text=f"{vm.percent:.0f} %")
             self.ram_detail.config(text=f"Usada: {used_gb:.2f} / {total_gb:.2f} GB")
+            psi_text = f"{memory_stall.some:.1f} %" if memory_stall else "N/D"
+            self.ram_pressure_compact.config(text=f"PSI: {psi_text}  Swap: {swap_mb_s:.2f} MB/s")
+            self.mini_chart('ram').update([self.history['ram'].values(MINI_POINTS)])
+            return
 
-        self.ram_data.append(vm.percent)
-        if len(self.ram_data) > 30:
-            self.ram_data.pop(0)
-        
-        if hasattr(self, 'ram_ax'):
-            self.ram_ax.clear()
-            self.ram_ax.set_facecolor('#2b2b2b')
-            self.ram_ax.plot(self.ram_data, color="cyan", linewidth=2)
-            self.ram_ax.set_xticks([])
-            self.ram_ax.set_yticks([])
-            self.ram_canvas.draw()
-
-        # Actualizar RAM expandida
-        if self.expanded and hasattr(self, 'ram_big_ax'):
-            self.ram_big_data.append(vm.percent)
-            if len(self.ram_big_data) > 100:
-                self.ram_big_data.pop(0)
-            
-            self.ram_big_ax.clear()
-            self.ram_big_ax.set_facecolor('#2b2b2b')
-            self.ram_big_ax.plot(self.ram_big_data, color="cyan", linewidth=2)
-            self.ram_big_ax.set_title("Uso de Memoria en Tiempo Real", color='white', fontsize=12)
-            self.ram_big_ax.set_ylabel("Uso (%)", color='white')
-            self.ram_big_ax.set_ylim(0, 100)
-            self.ram_big_ax.grid(True, alpha=0.3, color='white')
-            self.ram_big_ax.tick_params(colors='white')
-            self.ram_big_canvas.draw()
-            
-            if hasattr(self, 'ram_detailed'):
-                available_gb = vm.available / (1024**3)
-                self.ram_detailed['usage'].config(text=f"Uso: {vm.percent:.1f} %")
-                self.ram_detailed['used'].config(text=f"Usada: {used_gb:.2f} GB")
-                self.ram_detailed['available'].config(text=f"Disponible: {available_gb:.2f} GB")
-                self.ram_detailed['total'].config(text=f"Total: {total_gb:.2f} GB")
-
-        # DISCO
-        try:
-            du = psutil.disk_usage("C:\\")
-        except Exception:
-            du = psutil.disk_usage("/")
-        
-        if hasattr(self, 'disk_usage'):
+        if hasattr(self, 'ram_big_chart'):
+            self.ram_big_chart.update(*self.history_window('ram'))
+            self.ram_pressure_chart.update(*self.history_window(*STALL_KEYS))
+            self.ram_paging_chart.update(*self.history_window('page_in', 'page_out', 'swap_in', 'swap_out'))
+
+            available_gb = vm.available / (1024**3)
+            self.ram_detailed['usage'].config(text=f"Uso: {vm.percent:.1f} %")
+            self.ram_detailed['used'].config(text=f"Usada: {used_gb:.2f} GB")
+            self.ram_detailed['available'].config(text=f"Disponible: {available_gb:.2f} GB")
+            self.ram_detailed['total'].config(text=f"Total: {total_gb:.2f} GB")
+
+            # cached y buffers solo existen en Linux / macOS
+            cached = getattr(vm, 'cached', None)
+            buffers = getattr(vm, 'buffers', None)
+            self.ram_detailed_right['cached'].config(
+                text=f"En caché: {cached / (1024**3):.2f} GB" if cached is not None else "En caché: N/D")
+            self.ram_detailed_right['buffers'].config(
+                text=f"Buffers: {buffers / (1024**3):.2f} GB" if buffers is not None else "Buffers: N/D")
+            self.ram_detailed_right['swap'].config(
+                text=f"Swap: {swap.used / (1024**3):.2f} / {swap.total / (1024**3):.2f} GB ({swap.percent:.0f} %)")
+
+            lines = [f"{'PSI':<8} {'some':>7} {'full':>7}   media 60 s"]
+            for resource, text in (("memory", "Memoria"), ("io", "Disco"), ("cpu", "CPU")):
+                stall = snap['psi'].get(resource)
+                if stall is None:
+                    lines.append(f"{text:<8} {'N/D':>7}")
+                else:
+                    lines.append(f"{text:<8} {stall.some:6.1f}% {stall.full:6.1f}%   "
+                                 f"{stall.some_avg60:.1f} / {stall.full_avg60:.1f} %")
+            if snap['page_in_mb_s'] is not None:
+                lines.append(f"Paginación: entrada {snap['page_in_mb_s']:.2f}  salida {snap['page_out_mb_s']:.2f} MB/s  "
+                             f"fallos mayores {snap['major_faults_s']:.0f}/s")
+            lines.append(f"Swap: entrada {snap['swap_in_mb_s']:.2f}  salida {snap['swap_out_mb_s']:.2f} MB/s")
+            self.ram_pressure.config(text="\n".join(lines))
+
+    def render_disk(self, snap):
+        du = snap['du']
+        read_mb_s = snap['read_mb_s']
+        write_mb_s = snap['write_mb_s']
+
+        if not self.expanded:
             self.disk_usage.config(text=f"{du.percent:.0f} %")
             self.disk_free.config(text=f"Libre: {du.free / (1024**3):.2f} GB")
-
-        # I/O del disco
-        dio = psutil.disk_io_counters()
-        read_mb_s = (dio.read_bytes - self.prev_disk.read_bytes) / (1024*1024) / dt
-        write_mb_s = (dio.write_bytes - self.prev_disk.write_bytes) / (1024*1024) / dt
-        
-        if hasattr(self, 'disk_rw'):
             self.disk_rw.config(text=f"R/W: {read_mb_s:.2f} / {write_mb_s:.2f} MB/s")
-        
-        self.prev_disk = dio
-
-        disk_activity = read_mb_s + write_mb_s
-        self.disk_data.append(disk_activity)
-        if len(self.disk_data) > 30:
-            self.disk_data.pop(0)
-
-        if hasattr(self, 'disk_ax'):
-            self.disk_ax.clear()
-            self.disk_ax.set_facecolor('#2b2b2b')
-            self.disk_ax.plot(self.disk_data, color="orange", linewidth=2)
-            self.disk_ax.set_xticks([])
-            self.disk_ax.set_yticks([])
-            self.disk_canvas.draw()
-
-        # Actualizar disco expandido
-        if self.expanded and hasattr(self, 'disk_big_ax'):
-            self.disk_big_read_data.append(read_mb_s)
-            self.disk_big_write_data.append(write_mb_s)
-            if len(self.disk_big_read_data) > 100:
-                self.disk_big_read_data.pop(0)
-                self.disk_big_write_data.pop(0)
-            
-            self.disk_big_ax.clear()
-            self.disk_big_ax.set_facecolor('#2b2b2b')
-            self.disk_big_ax.plot(self.disk_big_read_data, color="green", linewidth=2, label="Lectura")
-            self.disk_big_ax.plot(self.disk_big_write_data, color="red", linewidth=2, label="Escritura")
-            self.disk_big_ax.set_title("Actividad del Disco en Tiempo Real", color='white', fontsize=12)
-            self.disk_big_ax.set_ylabel("MB/s", color='white')
-            self.disk_big_ax.legend()
-            self.disk_big_ax.grid(True, alpha=0.3, color='white')
-            self.disk_big_ax.tick_params(colors='white')
-            self.disk_big_canvas.draw()
-            
-            if hasattr(self, 'disk_detailed'):
-                used_gb = du.used / (1024**3)
-                free_gb = du.free / (1024**3)
-                total_gb = du.total / (1024**3)
-                
-                self.disk_detailed['usage'].config(text=f"Uso: {du.percent:.1f} %")
-                self.disk_detailed['free'].config(text=f"Libre: {free_gb:.2f} GB")
-                self.disk_detailed['used'].config(text=f"Usado: {used_gb:.2f} GB")
-                self.disk_detailed['total'].config(text=f"Total: {total_gb:.2f} GB")
-                
-                self.disk_detailed_right['read_speed'].config(text=f"Lectura: {read_mb_s:.2f} MB/s")
-                self.disk_detailed_right['write_speed'].config(text=f"Escritura: {write_mb_s:.2f} MB/s")
-                self.disk_detailed_right['total_io'].config(text=f"I/O Total: {read_mb_s + write_mb_s:.2f} MB/s")
-
-        # RED
-        net = psutil.net_io_counters()
-        up_mb_s = (net.bytes_sent - self.prev_net.bytes_sent) / (1024*1024) / dt
-        down_mb_s = (net.bytes_recv - self.prev_net.bytes_recv) / (1024*1024) / dt
-        
-        if hasattr(self, 'net_speed'):
+            self.mini_chart('disk').update([self.history['disk_read'].values(MINI_POINTS) + self.history['disk_write'].values(MINI_POINTS)])
+            return
+
+        if hasattr(self, 'disk_big_chart'):
+            self.disk_big_chart.update(*self.history_window('disk_read', 'disk_write'))
+
+            used_gb = du.used / (1024**3)
+            free_gb = du.free / (1024**3)
+            total_gb = du.total / (1024**3)
+
+            self.disk_detailed['usage'].config(text=f"Uso: {du.percent:.1f} %")
+            self.disk_detailed['free'].config(text=f"Libre: {free_gb:.2f} GB")
+            self.disk_detailed['used'].config(text=f"Usado: {used_gb:.2f} GB")
+            self.disk_detailed['total'].config(text=f"Total: {total_gb:.2f} GB")
+
+            self.disk_detailed_right['read_speed'].config(text=f"Lectura: {read_mb_s:.2f} MB/s")
+            self.disk_detailed_right['write_speed'].config(text=f"Escritura: {write_mb_s:.2f} MB/s")
+            self.disk_detailed_right['total_io'].config(text=f"I/O Total: {read_mb_s + write_mb_s:.2f} MB/s")
+
+            lines = [f"{d.name[:14]:<14} R {d.read_mb_s:8.2f}  W {d.write_mb_s:8.2f} MB/s" for d in snap['disks'][:TOP_DEVICES]]
+            self.disk_devices.config(text="\n".join(lines))
+
+    def render_net(self, snap):
+        net = snap['net']
+        up_mb_s = snap['up_mb_s']
+        down_mb_s = snap['down_mb_s']
+
+        if not self.expanded:
             self.net_speed.config(text=f"↑ {up_mb_s:.2f} MB/s   ↓ {down_mb_s:.2f} MB/s")
             self.net_total.config(text=f"Total: {net.bytes_sent/1024/1024:.1f} / {net.bytes_recv/1024/1024:.1f} MB")
-        
-        self.prev_net = net
+            self.mini_chart('net').update([self.history['net_up'].values(MINI_POINTS) + self.history['net_down'].values(MINI_POINTS)])
+            return
 
-        total_net = up_mb_s + down_mb_s
-        self.net_data.append(total_net)
-        if len(self.net_data) > 30:
-            self.net_data.pop(0)
-        
-        if hasattr(self, 'net_ax'):
-            self.net_ax.clear()
-            self.net_ax.set_facecolor('#2b2b2b')
-            self.net_ax.plot(self.net_data, color="yellow", linewidth=2)
-            self.net_ax.set_xticks([])
-            self.net_ax.set_yticks([])
-            self.net_canvas.draw()
-
-        # Actualizar red expandida
-        if self.expanded and hasattr(self, 'net_big_ax'):
-            self.net_big_upload_data.append(up_mb_s)
-            self.net_big_download_data.append(down_mb_s)
-            if len(self.net_big_upload_data) > 100:
-                self.net_big_upload_data.pop(0)
-                self.net_big_download_data.pop(0)
-            
-            self.net_big_ax.clear()
-            self.net_big_ax.set_facecolor('#2b2b2b')
-            self.net_big_ax.plot(self.net_big_upload_data, color="red", linewidth=2, label="↑ Subida")
-            self.net_big_ax.plot(self.net_big_download_data, color="green", linewidth=2, label="↓ Bajada")
-            self.net_big_ax.set_title("Actividad de Red en Tiempo Real", color='white', fontsize=12)
-            self.net_big_ax.set_ylabel("MB/s", color='white')
-            self.net_big_ax.legend()
-            self.net_big_ax.grid(True, alpha=0.3, color='white')
-            self.net_big_ax.tick_params(colors='white')
-            self.net_big_canvas.draw()
-            
-            if hasattr(self, 'net_detailed'):
-                self.net_detailed['upload'].config(text=f"↑ Subida: {up_mb_s:.2f} MB/s")
-                self.net_detailed['download'].config(text=f"↓ Bajada: {down_mb_s:.2f} MB/s")
-                self.net_detailed['total_sent'].config(text=f"Total enviado: {net.bytes_sent/1024/1024:.1f} MB")
-                self.net_detailed['total_recv'].config(text=f"Total recibido: {net.bytes_recv/1024/1024:.1f} MB")
-
-        # GPU
-        gpu_load = 0
-        if GPUtil_available:
-            gpus = GPUtil.getGPUs()
-            if gpus:
+        if hasattr(self, 'net_big_chart'):
+            self.net_big_chart.update(*self.history_window('net_up', 'net_down'))
+
+            self.net_detailed['upload'].config(text=f"↑ Subida: {up_mb_s:.2f} MB/s")
+            self.net_detailed['download'].config(text=f"↓ Bajada: {down_mb_s:.2f} MB/s")
+            self.net_detailed['total_sent'].config(text=f"Total enviado: {net.bytes_sent/1024/1024:.1f} MB")
+            self.net_detailed['total_recv'].config(text=f"Total recibido: {net.bytes_recv/1024/1024:.1f} MB")
+
+            lines = [f"{n.name[:14]:<14} ↑ {n.up_mb_s:7.2f}  ↓ {n.down_mb_s:7.2f}" for n in snap['nics'][:TOP_DEVICES]]
+            self.net_devices.config(text="Interfaces (MB/s)\n" + "\n".join(lines))
+
+    def render_gpu(self, snap):
+        gpus = snap['gpus']
+
+        if not self.expanded:
+            if snap['gpu_backend'] is None:
+                self.gpu_info.config(text="Sin nvidia-smi ni GPUtil")
+            elif not gpus:
+                self.gpu_info.config(text="No se detectaron GPUs")
+            else:
                 lines = []
                 for g in gpus:
-                    lines.append(f"{g.name}\n carga: {g.load*100:.0f}%  mem: {g.memoryUsed}/{g.memoryTotal} MB")
-                if hasattr(self, 'gpu_info'):
-                    self.gpu_info.config(text="\n".join(lines))
-                gpu_load = gpus[0].load*100
-                
-                # Actualizar GPU expandida
-                if self.expanded and hasattr(self, 'gpu_detailed'):
-                    gpu = gpus[0]
-                    self.gpu_detailed['name'].config(text=f"GPU: {gpu.name}")
-                    self.gpu_detailed['load'].config(text=f"Carga: {gpu.load*100:.1f} %")
-                    self.gpu_detailed['memory'].config(text=f"Memoria: {gpu.memoryUsed} / {gpu.memoryTotal} MB")
-                    if hasattr(gpu, 'temperature'):
-                        self.gpu_detailed['temp'].config(text=f"Temperatura: {gpu.temperature} °C")
+                    lines.append(f"{g.name}\n carga: {g.load*100:.0f}%  mem: {g.memoryUsed:.0f}/{g.memoryTotal:.0f} MB")
+                self.gpu_info.config(text="\n".join(lines))
+            self.mini_chart('gpu').update([self.history['gpu'].values(MINI_POINTS)])
+            return
+
+        if hasattr(self, 'gpu_big_chart'):
+            self.gpu_big_chart.update(*self.history_window('gpu'))
+
+            if gpus:
+                gpu = gpus[0]
+                self.gpu_detailed['name'].config(text=f"GPU: {gpu.name}")
+                self.gpu_detailed['load'].config(text=f"Carga: {gpu.load*100:.1f} %")
+                self.gpu_detailed['memory'].config(text=f"Memoria: {gpu.memoryUsed:.0f} / {gpu.memoryTotal:.0f} MB")
+                if gpu.temperature is not None:
+                    self.gpu_detailed['temp'].config(text=f"Temperatura: {gpu.temperature:.0f} °C")
+
+    def render_procs(self, snap):
+        top = snap['top_processes']
+        if not self.expanded or top is None or not hasattr(self, 'procs_table'):
+            return
+
+        rows = top[self.procs_sort.get()]
+        for i in range(TOP_PROCESSES):
+            if i < len(rows):
+                row = rows[i]
+                values = (row.pid, row.name, f"{row.cpu:.1f}", f"{row.rss / (1024*1024):.0f}",
+                          f"{row.io_rate / (1024*1024):.2f}")
             else:
-                if hasattr(self, 'gpu_info'):
-                    self.gpu_info.config(text="No se detectaron GPUs")
-        else:
-            if hasattr(self, 'gpu_info'):
-                self.gpu_info.config(text="GPUtil no instalado")
-
-        self.gpu_data.append(gpu_load)
-        if len(self.gpu_data) > 30:
-            self.gpu_data.pop(0)
-
-        if hasattr(self, 'gpu_ax'):
-            self.gpu_ax.clear()
-            self.gpu_ax.set_facecolor('#2b2b2b')
-            self.gpu_ax.plot(self.gpu_data, color="magenta", linewidth=2)
-            self.gpu_ax.set_xticks([])
-            self.gpu_ax.set_yticks([])
-            self.gpu_canvas.draw()
-
-        # Actualizar GPU expandida
-        if self.expanded and hasattr(self, 'gpu_big_ax'):
-            self.gpu_big_data.append(gpu_load)
-            if len(self.gpu_big_data) > 100:
-                self.gpu_big_data.pop(0)
-            
-            self.gpu_big_ax.clear()
-            self.gpu_big_ax.set_facecolor('#2b2b2b')
-            self.gpu_big_ax.plot(self.gpu_big_data, color="magenta", linewidth=2)
-            self.gpu_big_ax.set_title("Uso de GPU en Tiempo Real", color='white', fontsize=12)
-            self.gpu_big_ax.set_ylabel("Uso (%)", color='white')
-            self.gpu_big_ax.set_ylim(0, 100)
-            self.gpu_big_ax.grid(True, alpha=0.3, color='white')
-            self.gpu_big_ax.tick_params(colors='white')
-            self.gpu_big_canvas.draw()
-
-        # SISTEMA
-        if hasattr(self, 'sys_os'):
-            self.sys_os.config(text=f"OS: {platform.system()} {platform.release()}")
-            self.sys_host.config(text=f"Host: {platform.node()}")
-            boot = psutil.boot_time()
-            uptime_s = int(now - boot)
+                values = ("", "", "", "", "")
+            self.procs_table.item(str(i), values=values)
+
+    def render_sys(self, snap):
+        now = snap['time']
+
+        if not self.expanded:
+            self.sys_os.config(text=f"OS: {snap['os']}")
+            self.sys_host.config(text=f"Host: {snap['host']}")
+            uptime_s = int(now - snap['boot_time'])
             self.sys_uptime.config(text=f"Uptime: {uptime_s//3600}h {(uptime_s%3600)//60}m")
+            return
 
-        # Actualizar sistema expandido
-        if self.expanded and hasattr(self, 'sys_detailed'):
-            try:
-                import getpass
-                user = getpass.getuser()
-            except:
-                user = "N/A"
-            
-            boot_time = psutil.boot_time()
+        if hasattr(self, 'sys_detailed'):
+            boot_time = snap['boot_time']
             boot_time_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(boot_time))
             uptime_seconds = int(now - boot_time)
             uptime_text = f"{uptime_seconds//86400}d {(uptime_seconds%86400)//3600}h {(uptime_seconds%3600)//60}m"
-            
-            self.sys_detailed['os'].config(text=f"Sistema Operativo: {platform.system()} {platform.release()}")
-            self.sys_detailed['hostname'].config(text=f"Nombre del equipo: {platform.node()}")
+
+            self.sys_detailed['os'].config(text=f"Sistema Operativo: {snap['os']}")
+            self.sys_detailed['hostname'].config(text=f"Nombre del equipo: {snap['host']}")
             self.sys_detailed['uptime'].config(text=f"Tiempo activo: {uptime_text}")
             self.sys_detailed['boot_time'].config(text=f"Último inicio: {boot_time_str}")
-            self.sys_detailed['user'].config(text=f"Usuario: {user}")
-            try:
-                processes = len(psutil.pids())
-                self.sys_detailed['processes'].config(text=f"Procesos activos: {processes}")
-            except:
-                pass
-
-        # Actualizar estadísticas rápidas (solo en modo expandido)
-        if self.expanded and hasattr(self, 'quick_stats'):
-            self.quick_stats['cpu'].config(text=f"CPU: {cpu:.0f} %")
-            self.quick_stats['ram'].config(text=f"RAM: {vm.percent:.0f} %")
-            self.quick_stats['disk'].config(text=f"Disco: {du.percent:.0f} %")
-            self.quick_stats['net'].config(text=f"Red: {total_net:.1f} MB/s")
-
-        self.prev_time = now
-        self.root.after(1000, self.update_stats)
+            self.sys_detailed['user'].config(text=f"Usuario: {snap['user']}")
+            if snap['processes'] is not None:
+                self.sys_detailed['processes'].config(text=f"Procesos activos: {snap['processes']}")
 
     # Animaciones (mantener las originales)
     def on_enter(self, event):
@@ -1020,6 +1337,7 @@ class EdgeWidget:
         else:
             self.animating = False
             self.is_open = True
+            self.refresh_visible()
 
     def slide_out(self):
         if self.animating or not self.is_open:
@@ -1040,5 +1358,37 @@ class EdgeWidget:
 
 
 if __name__ == "__main__":
-    app = EdgeWidget()
-    app.root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Monitor de recursos en el borde de la pantalla")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="exporta las métricas en http://127.0.0.1:PUERTO/metrics (OpenMetrics)")
+    parser.add_argument("--debug", action="store_true",
+                        help="cronometra psutil y Matplotlib y muestra el overlay de tiempos (F12)")
+    parser.add_argument("--record", metavar="ARCHIVO", default=None,
+                        help="graba los contadores crudos de la sesión (ver Grabacion.py)")
+    parser.add_argument("--replay", metavar="ARCHIVO", default=None,
+                        help="muestra una grabación en lugar del equipo actual")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="velocidad de la reproducción (1 = tiempo real, 0 = lo más rápido posible)")
+    parser.add_argument("--agent", metavar="DIRECCION", action="append", default=[],
+                        help="añade un equipo remoto (equipo:puerto o unix:/ruta de un Agente.py); repetible")
+    args = parser.parse_args()
+
+    recorder = None
+    options = {}
+    if args.replay:
+        from Grabacion import Replay, ReplaySchedule
+        replay = Replay(args.replay)
+        # Una reproducción no escribe en el historial guardado en disco
+        options = dict(collector=replay.collector(TOP_PROCESSES), schedule=ReplaySchedule(replay, args.speed),
+                       history=memory_history(HISTORY_KEYS, HISTORY_CAPACITY))
+    else:
+        open_alert_log()
+        if args.record:
+            from Grabacion import Recorder
+            recorder = Recorder(args.record)
+            options = dict(collector=recorder.wrap(MetricCollector(top_n=TOP_PROCESSES)))
+
+    app = EdgeWidget(metrics_port=args.metrics_port, debug=args.debug, agents=args.agent, **options)
+    app.root.mainloop()
+    if recorder is not None:
+        recorder.close()
\ No newline at end of file
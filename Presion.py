@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+# Lectura de la presión de memoria en Linux: PSI (/proc/pressure/*) y los
+# contadores de paginación de /proc/vmstat. El porcentaje de RAM usada no
+# dice si el equipo está paginando; PSI mide el tiempo que las tareas
+# pasan paradas esperando memoria, disco o CPU:
+#   some -> al menos una tarea parada
+#   full -> todas las tareas no ociosas paradas a la vez (el equipo no avanza)
+# En otros sistemas (o kernels sin PSI) las funciones devuelven None.
+
+PSI_DIR = "/proc/pressure"
+PSI_RESOURCES = ("memory", "io", "cpu")
+VMSTAT_PATH = "/proc/vmstat"
+# pgpgin/pgpgout en KB; pswpin/pswpout y pgmajfault en páginas / fallos
+VMSTAT_FIELDS = ("pgpgin", "pgpgout", "pswpin", "pswpout", "pgmajfault")
+
+# total en microsegundos acumulados desde el arranque; avg* en %
+psi = namedtuple("psi", "some_avg10 some_avg60 some_total full_avg10 full_avg60 full_total")
+vmstat = namedtuple("vmstat", VMSTAT_FIELDS)
+# Porcentaje del tiempo parado entre dos lecturas (de los totales) y media de 60 s del kernel
+Stall = namedtuple("Stall", "some full some_avg60 full_avg60")
+
+
+def read_psi(resource):
+    # /proc/pressure/cpu no tiene línea full en kernels anteriores a 5.13
+    try:
+        with open(f"{PSI_DIR}/{resource}") as f:
+            text = f.read()
+    except OSError:
+        return None
+    values = {}
+    for line in text.splitlines():
+        kind, _, fields = line.partition(" ")
+        for field in fields.split():
+            key, _, value = field.partition("=")
+            values[f"{kind}_{key}"] = int(value) if key == "total" else float(value)
+    return psi(*(values.get(name, 0) for name in psi._fields))
+
+
+def read_vmstat():
+    try:
+        with open(VMSTAT_PATH) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    values = {}
+    for line in lines:
+        key, _, value = line.partition(" ")
+        if key in VMSTAT_FIELDS:
+            values[key] = int(value)
+    return vmstat(*(values.get(name, 0) for name in VMSTAT_FIELDS))
+
+
+def stall(cur, prev, dt):
+    # dt en segundos; los totales vienen en microsegundos
+    def pct(total, prev_total):
+        return min(100.0, max(0.0, (total - prev_total) / 1e4 / dt))
+    return Stall(pct(cur.some_total, prev.some_total), pct(cur.full_total, prev.full_total),
+                 cur.some_avg60, cur.full_avg60)
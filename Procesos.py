@@ -0,0 +1,95 @@
+import heapq
+import time
+from collections import namedtuple
+
+import psutil
+
+ProcessRow = namedtuple("ProcessRow", "pid create_time name cpu rss io_rate")
+
+# Criterios de la tabla: clave de ordenación de cada top-N
+SORT_KEYS = {
+    'cpu': lambda row: row.cpu,
+    'rss': lambda row: row.rss,
+    'io': lambda row: row.io_rate,
+}
+
+
+class _Entry:
+    __slots__ = ("proc", "name", "prev_io")
+
+    def __init__(self, proc, name):
+        self.proc = proc
+        self.name = name
+        self.prev_io = None
+
+
+class ProcessTable:
+    # Top-N de procesos por CPU, memoria (RSS) e I/O. Los psutil.Process se
+    # conservan entre ticks para que cpu_percent() mida el delta desde la
+    # última lectura; cada proceso se lee dentro de oneshot() y los top-N se
+    # eligen con un heap en lugar de ordenar la lista completa.
+    # La caché va por (pid, create_time): un PID reutilizado es otra clave y
+    # empieza con una entrada nueva. psutil guarda create_time() en cada
+    # Process tras la primera llamada, así que la clave sale de un Process
+    # recién creado (una lectura de stat por PID).
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self._cache = {}
+        self._prev_time = None
+
+    def _entry(self, pid):
+        current = psutil.Process(pid)
+        key = (pid, current.create_time())
+        entry = self._cache.get(key)
+        if entry is None:
+            with current.oneshot():
+                entry = _Entry(current, current.name())
+                # La primera llamada solo fija la referencia y devuelve 0
+                current.cpu_percent(None)
+            self._cache[key] = entry
+        return key, entry
+
+    def sample(self, pids=None):
+        now = time.monotonic()
+        dt = now - self._prev_time if self._prev_time else None
+        self._prev_time = now
+
+        if pids is None:
+            pids = psutil.pids()
+
+        rows = []
+        seen = set()
+        for pid in pids:
+            key = None
+            try:
+                key, entry = self._entry(pid)
+                proc = entry.proc
+                with proc.oneshot():
+                    cpu = proc.cpu_percent(None)
+                    rss = proc.memory_info().rss
+                    try:
+                        io = proc.io_counters()
+                        io_total = io.read_bytes + io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        io_total = None
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self._cache.pop(key, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+
+            io_rate = 0.0
+            if io_total is not None:
+                if entry.prev_io is not None and dt and io_total >= entry.prev_io:
+                    io_rate = (io_total - entry.prev_io) / dt
+                entry.prev_io = io_total
+
+            seen.add(key)
+            rows.append(ProcessRow(pid, key[1], entry.name, cpu, rss, io_rate))
+
+        # Procesos que ya no existen (o cuyo PID ya es de otro proceso)
+        for key in self._cache.keys() - seen:
+            del self._cache[key]
+
+        top = {key: heapq.nlargest(self.top_n, rows, key=sort_key) for key, sort_key in SORT_KEYS.items()}
+        return top
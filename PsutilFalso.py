@@ -0,0 +1,193 @@
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Sustituto determinista de psutil para los benchmarks: mismas funciones y
+# namedtuples que usan Recolector, Procesos y Dispositivos, con valores que
+# solo dependen del número de tick. Se instala antes de importar el resto:
+#
+#   import PsutilFalso
+#   PsutilFalso.install()
+#   import Recolector
+#
+# advance() pasa al siguiente tick (los contadores crecen a ritmo fijo).
+# install() también sustituye Colectores.clock por un reloj ligado al tick,
+# así que las tasas (MB/s) no dependen de lo que tarde cada tick, y las
+# lecturas de /proc de Presion (PSI y vmstat) por contadores deterministas.
+
+CORES = 8
+PROCESSES = 300
+DISKS = ("nvme0n1", "sda")
+# Como en Linux, perdisk también lista las particiones (con la actividad del disco)
+PARTITIONS = {"nvme0n1p1": 0, "sda1": 1}
+NICS = ("lo", "eth0", "wlan0")
+GB = 1024 ** 3
+MB = 1024 ** 2
+# Segundos del reloj falso por tick
+TICK_S = 1.0
+
+scpufreq = namedtuple("scpufreq", "current min max")
+svmem = namedtuple("svmem", "total available percent used free active inactive buffers cached shared slab")
+sswap = namedtuple("sswap", "total used free percent sin sout")
+sdiskusage = namedtuple("sdiskusage", "total used free percent")
+sdiskio = namedtuple("sdiskio", "read_count write_count read_bytes write_bytes read_time write_time")
+snetio = namedtuple("snetio", "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout")
+pmem = namedtuple("pmem", "rss vms")
+pio = namedtuple("pio", "read_count write_count read_bytes write_bytes")
+
+
+class Error(Exception):
+    pass
+
+
+class NoSuchProcess(Error):
+    pass
+
+
+class ZombieProcess(NoSuchProcess):
+    pass
+
+
+class AccessDenied(Error):
+    pass
+
+
+_tick = 0
+_clock_reads = 0
+
+
+def advance(n=1):
+    global _tick, _clock_reads
+    _tick += n
+    _clock_reads = 0
+
+
+def reset():
+    global _tick, _clock_reads
+    _tick = 0
+    _clock_reads = 0
+
+
+def clock():
+    # Cada lectura avanza 1 µs dentro del tick para que el reloj siga
+    # siendo creciente (stamped lee dos veces por contador)
+    global _clock_reads
+    _clock_reads += 1
+    return _tick * TICK_S + _clock_reads * 1e-6
+
+
+def install():
+    sys.modules["psutil"] = sys.modules[__name__]
+    import Colectores
+    import Presion
+    Colectores.clock = clock
+    Presion.read_psi = read_psi
+    Presion.read_vmstat = read_vmstat
+
+
+def _wave(i, period=17):
+    # Valor 0-100 que varía con el tick y el índice, sin aleatoriedad
+    return (i * 37 + _tick * 7) % period * 100 / (period - 1)
+
+
+def cpu_count(logical=True):
+    return CORES if logical else CORES // 2
+
+
+def cpu_percent(interval=None, percpu=False):
+    if percpu:
+        return [_wave(i) for i in range(CORES)]
+    return sum(_wave(i) for i in range(CORES)) / CORES
+
+
+def cpu_freq():
+    return scpufreq(2400.0 + _tick % 5 * 100, 800.0, 4800.0)
+
+
+def boot_time():
+    return 1_700_000_000.0
+
+
+def virtual_memory():
+    total = 16 * GB
+    used = int(total * (0.4 + 0.2 * _wave(0) / 100))
+    return svmem(total, total - used, used * 100 / total, used, total - used - 2 * GB,
+                 used // 2, used // 4, 512 * MB, 2 * GB, 256 * MB, 128 * MB)
+
+
+def swap_memory():
+    total = 4 * GB
+    used = 256 * MB
+    return sswap(total, used, total - used, used * 100 / total, _tick * MB, _tick * MB // 2)
+
+
+def read_psi(resource):
+    # Tiempo parado creciente (µs por tick) y medias que varían con el tick
+    from Presion import PSI_RESOURCES, psi
+    i = PSI_RESOURCES.index(resource)
+    some = _wave(i) / 10
+    return psi(some, some / 2, _tick * (i + 1) * 20_000, some / 4, some / 8, _tick * (i + 1) * 5_000)
+
+
+def read_vmstat():
+    from Presion import vmstat
+    return vmstat(_tick * 2048, _tick * 1024, _tick * 16, _tick * 8, _tick * 3)
+
+
+def disk_usage(path):
+    total = 512 * GB
+    used = 200 * GB
+    return sdiskusage(total, used, total - used, used * 100 / total)
+
+
+def _disk(i):
+    return sdiskio(_tick * 10, _tick * 5, _tick * (i + 1) * 4 * MB, _tick * (i + 1) * MB, _tick, _tick)
+
+
+def disk_io_counters(perdisk=False, nowrap=True):
+    disks = {name: _disk(i) for i, name in enumerate(DISKS)}
+    if perdisk:
+        disks.update((name, _disk(i)) for name, i in PARTITIONS.items())
+        return disks
+    return sdiskio(*(sum(column) for column in zip(*disks.values())))
+
+
+def _nic(i):
+    return snetio(_tick * i * MB, _tick * i * 3 * MB, _tick * 100, _tick * 300, 0, 0, 0, 0)
+
+
+def net_io_counters(pernic=False, nowrap=True):
+    nics = {name: _nic(i) for i, name in enumerate(NICS)}
+    if pernic:
+        return nics
+    return snetio(*(sum(column) for column in zip(*nics.values())))
+
+
+def pids():
+    return list(range(1, PROCESSES + 1))
+
+
+class Process:
+    def __init__(self, pid):
+        if not 1 <= pid <= PROCESSES:
+            raise NoSuchProcess(pid)
+        self.pid = pid
+
+    @contextmanager
+    def oneshot(self):
+        yield
+
+    def create_time(self):
+        return boot_time() + self.pid
+
+    def name(self):
+        return f"proceso-{self.pid}"
+
+    def cpu_percent(self, interval=None):
+        return _wave(self.pid, period=29)
+
+    def memory_info(self):
+        return pmem(self.pid * 4 * MB, self.pid * 8 * MB)
+
+    def io_counters(self):
+        return pio(_tick, _tick, _tick * self.pid * 1024, _tick * 512)
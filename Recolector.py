@@ -0,0 +1,311 @@
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+from BackendGPU import create_gpu_monitor
+from Exportador import DEFAULT_PORT, MetricsExporter
+from Colectores import (CollectorRegistry, CpuCollector, DiskCollector, GpuCollector, MemoryCollector,
+                        NetCollector, PressureCollector, ProcessCollector, SystemCollector, SystemFacts)
+
+log = logging.getLogger("Recolector")
+
+
+class MetricCollector:
+    # Recolección de métricas sin interfaz: la usan el widget (a través de
+    # MetricSampler) y el modo headless de línea de comandos. Cada sección
+    # es un colector del registro (Colectores), con su intervalo y sus
+    # tiempos; extra_collectors añade colectores propios.
+    def __init__(self, gpu_monitor=None, top_n=10, extra_collectors=()):
+        self.facts = SystemFacts()
+        # nvidia-smi persistente con GPUtil como respaldo
+        self.gpu = gpu_monitor or create_gpu_monitor()
+        # La tabla de procesos solo se lee cuando alguien la necesita
+        self.processes = ProcessCollector(top_n)
+
+        self.registry = CollectorRegistry([
+            SystemCollector(self.facts),
+            CpuCollector(self.facts),
+            MemoryCollector(),
+            PressureCollector(),
+            DiskCollector(),
+            NetCollector(),
+            GpuCollector(self.gpu),
+            self.processes,
+        ])
+        for collector in extra_collectors:
+            self.registry.register(collector)
+
+    @property
+    def processes_enabled(self):
+        return self.processes.enabled
+
+    @processes_enabled.setter
+    def processes_enabled(self, value):
+        self.processes.enabled = value
+
+    def sample(self, now=None):
+        # now permite calcular la muestra con una hora grabada (Grabacion)
+        return self.registry.collect(time.time() if now is None else now)
+
+    def close(self):
+        self.registry.close()
+
+
+def _activity(snap):
+    return {
+        'cpu': snap['cpu'],
+        'ram': snap['vm'].percent,
+        'disk': snap['read_mb_s'] + snap['write_mb_s'],
+        'net': snap['up_mb_s'] + snap['down_mb_s'],
+    }
+
+
+class AdaptiveInterval:
+    # Intervalo de muestreo según lo que se está viendo: rápido con la vista
+    # expandida, 1 s en la compacta y casi nada con la ventana escondida.
+    # Un cambio brusco en alguna métrica pasa al extremo rápido del rango
+    # durante BURST_S para no perder picos cortos.
+    RATES = {
+        'expanded': (0.1, 0.25),
+        'compact': (0.5, 1.0),
+        'hidden': (5.0, 10.0),
+    }
+    BURST_S = 5.0
+    # Variación entre dos muestras que cuenta como cambio brusco
+    SPIKES = {'cpu': 20.0, 'ram': 10.0, 'disk': 20.0, 'net': 5.0}
+
+    def __init__(self, state='compact'):
+        self.state = state
+        self._prev = None
+        self._burst_until = 0.0
+
+    def next(self, snap, now=None):
+        now = time.monotonic() if now is None else now
+        current = _activity(snap)
+        if self._prev is not None and any(
+                abs(current[key] - self._prev[key]) >= limit for key, limit in self.SPIKES.items()):
+            self._burst_until = now + self.BURST_S
+        self._prev = current
+
+        fast, slow = self.RATES[self.state]
+        return fast if now < self._burst_until else slow
+
+
+class DeadlineTicker:
+    # Plazos absolutos sobre un reloj monotónico (perf_counter, con
+    # resolución fina también en Windows): el siguiente tick es el plazo
+    # anterior + intervalo, no "al terminar + intervalo", así que lo que
+    # tarda cada muestra no se acumula como deriva. Si una muestra se
+    # come plazos enteros se cuentan en missed y se salta al siguiente plazo
+    # futuro en lugar de encadenar ticks atrasados.
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.deadline = None
+        self.ticks = 0
+        self.missed = 0
+
+    def wait_time(self, interval):
+        # Segundos hasta el siguiente plazo
+        now = self.clock()
+        self.ticks += 1
+        if self.deadline is None or interval <= 0:
+            self.deadline = now + max(0.0, interval)
+            return self.deadline - now
+        self.deadline += interval
+        if now > self.deadline:
+            late = int((now - self.deadline) // interval) + 1
+            self.missed += late
+            self.deadline += late * interval
+        return self.deadline - now
+
+    def reset(self):
+        # El siguiente plazo se cuenta desde ahora (p. ej. tras un cambio de ritmo)
+        self.deadline = None
+
+
+class MetricSampler:
+    # Hilo que toma las métricas fuera del bucle de Tk y deja cada muestra
+    # en una cola acotada; la interfaz solo lee la más reciente. Con un
+    # schedule (AdaptiveInterval) el intervalo cambia en cada muestra; los
+    # ticks van a plazos fijos de DeadlineTicker.
+    # Los ticks fallidos (colector o listeners) se cuentan en errors y se
+    # registran como mucho una vez cada ERROR_LOG_S
+    ERROR_LOG_S = 60.0
+
+    def __init__(self, interval=1.0, maxsize=2, collector=None, schedule=None):
+        self.interval = interval
+        self.schedule = schedule
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.collector = collector or MetricCollector()
+        # Callbacks que reciben cada muestra en el hilo del muestreador (p. ej.
+        # el historial), antes de que la interfaz descarte las intermedias
+        self.listeners = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.ticker = DeadlineTicker()
+        self.errors = 0
+        self._next_error_log = 0.0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="MetricSampler", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self.thread is None:
+            self.collector.close()
+
+    def set_state(self, state):
+        # Al cambiar de estado se despierta el hilo para no esperar los
+        # segundos que quedaran del intervalo anterior (p. ej. al salir de 'hidden')
+        if self.schedule is not None and self.schedule.state != state:
+            self.schedule.state = state
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            interval = self.interval
+            try:
+                snap = self.sample()
+                if self.schedule is not None:
+                    interval = self.schedule.next(snap)
+                self.publish(snap)
+            except EOFError:
+                # Fin de una reproducción: no quedan muestras
+                break
+            except Exception:
+                # Una llamada fallida no debe matar el hilo; se reintenta en el siguiente tick
+                self.errors += 1
+                now = time.monotonic()
+                if now >= self._next_error_log:
+                    self._next_error_log = now + self.ERROR_LOG_S
+                    log.debug("fallo en el muestreo (%d en total)", self.errors, exc_info=True)
+            if self._wake.wait(self.ticker.wait_time(interval)):
+                # Despertado antes del plazo (set_state): se cuenta desde aquí
+                self._wake.clear()
+                self.ticker.reset()
+        self.collector.close()
+
+    def sample(self):
+        snap = self.collector.sample()
+        for listener in self.listeners:
+            listener(snap)
+        return snap
+
+    def publish(self, snap):
+        # Si la cola está llena se descarta la muestra más vieja
+        while True:
+            try:
+                self.queue.put_nowait(snap)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def latest(self):
+        snap = None
+        while True:
+            try:
+                snap = self.queue.get_nowait()
+            except queue.Empty:
+                return snap
+
+
+def snapshot_to_record(snap):
+    # Convierte una muestra en un dict plano serializable a JSON
+    record = {}
+    for key, value in snap.items():
+        if hasattr(value, '_asdict'):
+            record[key] = value._asdict()
+        elif key in ('gpus', 'disks', 'nics'):
+            record[key] = [row._asdict() for row in value]
+        elif key == 'psi':
+            record[key] = {k: row and row._asdict() for k, row in value.items()}
+        elif key == 'top_processes' and value is not None:
+            record[key] = {k: [row._asdict() for row in rows] for k, rows in value.items()}
+        else:
+            record[key] = value
+    return record
+
+
+def collect(interval, output, count=None, gpu_binary="nvidia-smi", top=0):
+    collector = MetricCollector(create_gpu_monitor(gpu_binary, period_ms=max(100, int(interval * 1000))), top_n=top)
+    collector.processes_enabled = top > 0
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    ticker = DeadlineTicker()
+    taken = 0
+    try:
+        while count is None or taken < count:
+            output.write(encode(snapshot_to_record(collector.sample())))
+            output.write("\n")
+            output.flush()
+            taken += 1
+            if count is None or taken < count:
+                time.sleep(ticker.wait_time(interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.close()
+
+
+def serve(interval, port=DEFAULT_PORT, gpu_binary="nvidia-smi", host="127.0.0.1"):
+    # Solo el exportador OpenMetrics: el muestreador renderiza el texto en
+    # cada muestra y los scrapes leen el último
+    collector = MetricCollector(create_gpu_monitor(gpu_binary, period_ms=max(100, int(interval * 1000))))
+    sampler = MetricSampler(interval=interval, collector=collector)
+    exporter = MetricsExporter(port, host, stats=lambda: {'collectors': collector.registry.summary()})
+    sampler.listeners.append(exporter.publish)
+    exporter.start()
+    sampler.start()
+    print(f"Exportando en http://{host}:{exporter.port}/metrics", file=sys.stderr)
+    try:
+        while sampler.thread.is_alive():
+            sampler.thread.join(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        exporter.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="Recolector", description="Recolector de métricas sin interfaz gráfica")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_collect = sub.add_parser("collect", help="emite una muestra JSON por línea")
+    p_collect.add_argument("--interval", type=float, default=1.0, help="segundos entre muestras (por defecto 1.0)")
+    p_collect.add_argument("--output", default="-", help="archivo JSONL de salida ('-' para stdout)")
+    p_collect.add_argument("--count", type=int, default=None, help="número de muestras antes de salir")
+    p_collect.add_argument("--gpu-binary", default="nvidia-smi", help="ejecutable compatible con nvidia-smi")
+    p_collect.add_argument("--top", type=int, default=0, help="incluye los N procesos principales (0 = desactivado)")
+
+    p_serve = sub.add_parser("serve", help="exporta la última muestra en formato OpenMetrics por HTTP")
+    p_serve.add_argument("--interval", type=float, default=1.0, help="segundos entre muestras (por defecto 1.0)")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"puerto HTTP (por defecto {DEFAULT_PORT})")
+    p_serve.add_argument("--host", default="127.0.0.1", help="dirección de escucha (por defecto solo localhost)")
+    p_serve.add_argument("--gpu-binary", default="nvidia-smi", help="ejecutable compatible con nvidia-smi")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "collect":
+        if args.output == "-":
+            collect(args.interval, sys.stdout, args.count, args.gpu_binary, args.top)
+        else:
+            with open(args.output, "a", encoding="utf-8") as output:
+                collect(args.interval, output, args.count, args.gpu_binary, args.top)
+    elif args.command == "serve":
+        serve(args.interval, args.port, args.gpu_binary, args.host)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+from Alertas import Absent, AlertEngine, Average, RateOfChange, Sustained, default_rules
+from Recolector import AdaptiveInterval
+
+# Intervalo más lento del muestreo (ventana escondida): más largo que la
+# ventana de 5 s de la regla de escritura en disco
+HIDDEN_INTERVAL_S = AdaptiveInterval.RATES['hidden'][1]
+
+
+def run(rule, values, step):
+    return [rule.update(i * step, value) for i, value in enumerate(values)]
+
+
+def test_rate_of_change_fires_with_samples_wider_than_window():
+    rule = RateOfChange("escritura", "disk_write", 100, 5)
+    # 0 -> 2000 MB/s en 10 s: 200 MB/s por segundo
+    assert run(rule, [0, 0, 2000], HIDDEN_INTERVAL_S) == [False, False, True]
+
+
+def test_rate_of_change_uses_window_start_at_fast_interval():
+    rule = RateOfChange("escritura", "disk_write", 100, 5)
+    # Subida lenta y constante (50 MB/s por segundo) durante 10 s
+    assert not any(run(rule, [i * 25 for i in range(21)], 0.5))
+    assert len(rule._points) <= 12
+
+
+def test_rate_of_change_negative_limit():
+    rule = RateOfChange("caída", "net_down", -10, 5)
+    assert run(rule, [500, 0], HIDDEN_INTERVAL_S) == [False, True]
+
+
+def test_average_at_hidden_interval():
+    rule = Average("red", "net_down", ">", 50, 60)
+    results = run(rule, [100] * 8 + [0] * 8, HIDDEN_INTERVAL_S)
+    assert results[:8] == [True] * 8
+    assert results[-1] is False
+
+
+def test_sustained_at_hidden_interval():
+    rule = Sustained("cpu", "cpu", ">", 90, 60)
+    results = run(rule, [95] * 8, HIDDEN_INTERVAL_S)
+    assert results.index(True) == 6
+
+
+def test_absent_after_timeout():
+    rule = Absent("gpu", "gpu", 30)
+    assert run(rule, [None, 1, None, None, None, None], HIDDEN_INTERVAL_S) == [False, False, False, False, True, True]
+
+
+def test_engine_reports_state_changes_at_hidden_interval():
+    engine = AlertEngine(default_rules())
+    events = []
+    for i, write in enumerate([0, 0, 3000, 3000]):
+        events += engine.evaluate(i * HIDDEN_INTERVAL_S, {'disk_write': write, 'gpu': 1})
+    assert [(e.rule, e.firing) for e in events] == [
+        ("Pico de escritura en disco", True), ("Pico de escritura en disco", False)]
+    assert engine.firing == ()